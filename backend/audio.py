@@ -0,0 +1,153 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import os
+import re
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+AUDIO_BUCKET = "audio"
+AUDIO_CHUNK_SIZE = int(os.getenv("AUDIO_CHUNK_SIZE", str(255 * 1024)))  # GridFS chunk and streaming read size
+AUDIO_MAX_BYTES = int(os.getenv("AUDIO_MAX_BYTES", str(100 * 1024 * 1024)))
+# Room for multipart boundaries and part headers when checking Content-Length
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single-range ``Range`` header into inclusive ``(start, end)``.
+
+    Returns None when the whole file should be sent, including for
+    headers we do not understand (multiple ranges, other units), which
+    RFC 9110 allows us to ignore.
+    """
+    if not header:
+        return None
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if size == 0:
+        # An empty file has no byte positions to serve
+        raise RangeNotSatisfiable()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+class MultipartFileStream:
+    """One file field of a multipart/form-data body, parsed as it arrives.
+
+    The body is fed to python-multipart's incremental parser straight from
+    ``request.stream()``, so nothing is spooled and only the current network
+    chunk is held in memory. Call ``open`` to read up to the field's
+    headers, then iterate ``chunks``; other fields are skipped.
+    """
+
+    def __init__(self, request, field: str = "file", max_bytes: int = AUDIO_MAX_BYTES):
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise ValueError("Expected a multipart/form-data body")
+        # Refuse before reading when the declared body is already too large
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+            raise UploadTooLarge(f"Audio exceeds {max_bytes // (1024 * 1024)}MB")
+
+        self.field = field.encode()
+        self.max_bytes = max_bytes
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self._body = request.stream()
+        self._events: List[Tuple[str, Any]] = []
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": lambda: self._events.append(("headers", self._headers)),
+            "on_part_data": lambda data, start, end: self._events.append(("data", data[start:end])),
+            "on_part_end": lambda: self._events.append(("end", None)),
+        })
+        self._stream = self._parse()
+
+    async def open(self):
+        async for kind, headers in self._stream:
+            if kind != "headers":
+                continue
+            _, options = parse_options_header(headers.get(b"content-disposition", b""))
+            if options.get(b"name") == self.field and b"filename" in options:
+                self.filename = options[b"filename"].decode(errors="replace")
+                self.content_type = headers.get(b"content-type", b"").decode(errors="replace")
+                return
+        raise ValueError(f"Missing file field '{self.field.decode()}'")
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        # The opened field's data, enforcing the size cap as it arrives
+        received = 0
+        async for kind, data in self._stream:
+            if kind == "end":
+                return
+            if kind == "data" and data:
+                received += len(data)
+                if received > self.max_bytes:
+                    raise UploadTooLarge(f"Audio exceeds {self.max_bytes // (1024 * 1024)}MB")
+                yield data
+        raise ValueError("Upload ended before the file did")
+
+    async def _parse(self) -> AsyncIterator[Tuple[str, Any]]:
+        async for chunk in self._body:
+            if chunk:
+                self._parser.write(chunk)
+            events, self._events = self._events, []
+            for event in events:
+                yield event
+        self._parser.finalize()
+
+    def _on_part_begin(self):
+        self._headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+
+async def iter_grid_out(grid_out, start: int, length: int) -> AsyncIterator[bytes]:
+    # Streams ``length`` bytes from ``start``; at most one chunk is held in memory
+    grid_out.seek(start)
+    remaining = length
+    while remaining > 0:
+        chunk = await grid_out.read(min(AUDIO_CHUNK_SIZE, remaining))
+        if not chunk:
+            return
+        remaining -= len(chunk)
+        yield chunk
@@ -1,18 +1,82 @@
 import jwt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from passlib.context import CryptContext
+import asyncio
 import os
+import time
+
+from backend.cache import TTLCache
 
 # JWT settings
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "hushhush-secret-key-2024-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
 
+# Verified token cache settings
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+# Password hashing pool settings
+AUTH_WORKERS = int(os.getenv("AUTH_WORKERS", "4"))
+AUTH_MAX_PENDING = int(os.getenv("AUTH_MAX_PENDING", "64"))
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
+# token -> user id for tokens that already passed signature and expiry checks
+token_cache = TTLCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_SECONDS)
+
+class AuthPoolSaturated(Exception):
+    pass
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL, so threads give real parallelism. Calls beyond
+    ``max_pending`` in flight are rejected with AuthPoolSaturated instead of
+    queueing without bound.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+
+    async def _run(self, func, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise AuthPoolSaturated("Authentication service is busy, please retry")
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(pwd_context.verify, password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+password_hasher = PasswordHasher(AUTH_WORKERS, AUTH_MAX_PENDING)
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -21,6 +85,10 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 def verify_token(token: str):
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -30,6 +98,8 @@ def verify_token(token: str):
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        # Never cache a token past its own expiry
+        token_cache.set(token, user_id, ttl=payload.get("exp", 0) - time.time())
         return user_id
     except jwt.PyJWTError:
         raise HTTPException(
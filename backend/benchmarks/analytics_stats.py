@@ -0,0 +1,107 @@
+"""Compare the legacy seven-query analytics path with the single-pass one.
+
+Loads a synthetic dataset (1M vaults / 5M users by default) into a
+scratch database, then times both implementations of the
+/api/analytics/stats computation.
+
+    python -m backend.benchmarks.analytics_stats --vaults 1000000 --users 5000000
+    python -m backend.benchmarks.analytics_stats --skip-load   # reuse a loaded dataset
+"""
+from backend.database import Database
+from backend.models import *
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+import uuid
+
+BATCH_SIZE = 10000
+
+
+async def load_dataset(db: Database, vaults: int, users: int):
+    await db.db.vaults.drop()
+    await db.db.users.drop()
+
+    user_types = [UserType.WHISPERER.value, UserType.LISTENER.value, UserType.BOTH.value]
+    for offset in range(0, users, BATCH_SIZE):
+        await db.db.users.insert_many([{
+            "id": str(uuid.uuid4()),
+            "email": f"user{offset + i}@example.com",
+            "username": f"user{offset + i}",
+            "user_type": random.choice(user_types),
+            "is_verified": random.random() < 0.2,
+        } for i in range(min(BATCH_SIZE, users - offset))], ordered=False)
+
+    statuses = [status.value for status in VaultStatus]
+    now = datetime.utcnow()
+    for offset in range(0, vaults, BATCH_SIZE):
+        await db.db.vaults.insert_many([{
+            "id": str(uuid.uuid4()),
+            "title": f"Vault {offset + i}",
+            "status": random.choice(statuses),
+            "category": random.choice(list(Category)).value,
+            "funding_goal": 10000.0,
+            "pledged_amount": float(random.randint(0, 20000)),
+            "created_at": now - timedelta(minutes=offset + i),
+        } for i in range(min(BATCH_SIZE, vaults - offset))], ordered=False)
+
+
+async def legacy_stats(db: Database):
+    # The pre-aggregation implementation: seven sequential collection passes
+    await db.db.vaults.count_documents({})
+    await db.db.vaults.count_documents({"status": VaultStatus.LIVE})
+    await db.db.vaults.count_documents({"status": {"$in": [VaultStatus.FUNDED, VaultStatus.UNLOCKED]}})
+    await db.db.vaults.aggregate([
+        {"$group": {"_id": None, "total_pledged": {"$sum": "$pledged_amount"}, "total_goal": {"$sum": "$funding_goal"}}}
+    ]).to_list(1)
+    await db.db.users.count_documents({})
+    await db.db.users.count_documents({"user_type": {"$in": [UserType.WHISPERER, UserType.BOTH]}})
+    await db.db.users.count_documents({"user_type": {"$in": [UserType.LISTENER, UserType.BOTH]}})
+    await db.db.users.count_documents({"is_verified": True})
+
+
+async def single_pass_stats(db: Database):
+    await asyncio.gather(db.get_vault_stats(), db.get_user_stats())
+
+
+async def timed(label: str, func, db: Database, runs: int):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await func(db)
+        samples.append((time.perf_counter() - start) * 1000)
+    print(f"{label:>12}: median={statistics.median(samples):9.1f}ms min={min(samples):9.1f}ms over {runs} runs")
+    return statistics.median(samples)
+
+
+async def run(args):
+    mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+    db_name = os.environ.get('BENCH_DB_NAME', 'hushhush_bench')
+    db = Database(mongo_url, db_name)
+
+    try:
+        if not args.skip_load:
+            start = time.perf_counter()
+            await load_dataset(db, args.vaults, args.users)
+            print(f"loaded {args.vaults} vaults / {args.users} users in {time.perf_counter() - start:.1f}s")
+
+        legacy = await timed("legacy", legacy_stats, db, args.runs)
+        single_pass = await timed("single-pass", single_pass_stats, db, args.runs)
+        print(f"speedup: {legacy / single_pass:.2f}x")
+    finally:
+        if not args.keep:
+            await db.client.drop_database(db_name)
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vaults", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=5_000_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-load", action="store_true", help="reuse the dataset from a previous --keep run")
+    parser.add_argument("--keep", action="store_true", help="leave the dataset in place afterwards")
+    asyncio.run(run(parser.parse_args()))
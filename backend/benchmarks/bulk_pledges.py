@@ -0,0 +1,72 @@
+"""Bulk pledge ingestion benchmark.
+
+Ingests one batch of pledges spread across a handful of vaults through
+Database.create_pledges_bulk and checks the vault totals afterwards.
+
+    python -m backend.benchmarks.bulk_pledges --pledges 10000 --vaults 20
+"""
+from backend.database import Database
+from backend.models import *
+import argparse
+import asyncio
+import os
+import time
+
+
+async def run(pledges: int, vaults: int, amount: float):
+    mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+    db_name = os.environ.get('BENCH_DB_NAME', 'hushhush_bench')
+
+    db = Database(mongo_url, db_name)
+    await db.client.drop_database(db_name)
+
+    try:
+        await db.ensure_indexes()
+
+        # Insert fixtures directly; bcrypt is not what we are measuring
+        listener = User(email="bench@example.com", username="bench", password_hash="x", user_type=UserType.BOTH)
+        await db.db.users.insert_one(listener.dict())
+
+        vault_ids = []
+        for i in range(vaults):
+            vault = await db.create_vault(VaultCreate(
+                title=f"Bulk vault {i}",
+                description="Benchmark vault",
+                category=Category.UNHINGED,
+                secret_type=SecretType.TEXT,
+                content="secret",
+                preview="preview",
+                funding_goal=pledges * amount,
+                duration_days=1
+            ), listener.id)
+            vault_ids.append(vault.id)
+
+        items = [
+            BulkPledgeItem(vault_id=vault_ids[i % vaults], user_id=listener.id, amount=amount)
+            for i in range(pledges)
+        ]
+
+        start = time.perf_counter()
+        results = await db.create_pledges_bulk(items)
+        elapsed = time.perf_counter() - start
+
+        created = sum(1 for result in results if result.pledge_id)
+        backers = sum([(await db.get_vault_by_id(vault_id)).backers_count for vault_id in vault_ids])
+        print(f"pledges={pledges} vaults={vaults} elapsed={elapsed:.3f}s rate={pledges / elapsed:.0f} pledges/sec")
+
+        if created != pledges or backers != pledges:
+            print(f"FAIL: created={created} backers={backers}")
+            raise SystemExit(1)
+        print("OK: every pledge applied to its vault")
+    finally:
+        await db.client.drop_database(db_name)
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pledges", type=int, default=10000)
+    parser.add_argument("--vaults", type=int, default=20)
+    parser.add_argument("--amount", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.pledges, args.vaults, args.amount))
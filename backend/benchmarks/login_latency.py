@@ -0,0 +1,89 @@
+"""Measure /api/vaults latency with and without a background login burst.
+
+Start the API first, then:
+
+    python -m backend.benchmarks.login_latency --base-url http://localhost:8001 --logins-per-sec 50
+
+With bcrypt on the event loop the loaded p99 jumps by hundreds of
+milliseconds; with the hashing pool it should stay close to the idle run.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import statistics
+import threading
+import time
+import uuid
+import requests
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def measure_vaults(base_url: str, requests_count: int):
+    session = requests.Session()
+    samples = []
+    for _ in range(requests_count):
+        start = time.perf_counter()
+        session.get(f"{base_url}/api/vaults?limit=20").raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def login_load(base_url: str, credentials: dict, rate: int, stop: threading.Event, results: dict):
+    interval = 1.0 / rate
+
+    def login():
+        response = requests.post(f"{base_url}/api/auth/login", json=credentials)
+        results[response.status_code] = results.get(response.status_code, 0) + 1
+
+    with ThreadPoolExecutor(max_workers=rate) as pool:
+        next_at = time.perf_counter()
+        while not stop.is_set():
+            pool.submit(login)
+            next_at += interval
+            time.sleep(max(0.0, next_at - time.perf_counter()))
+
+
+def report(label: str, samples):
+    print(f"{label:>8}: p50={statistics.median(samples):7.1f}ms "
+          f"p99={percentile(samples, 99):7.1f}ms max={max(samples):7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--logins-per-sec", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    credentials = {"email": f"bench-{uuid.uuid4().hex[:8]}@example.com", "password": "benchmark-password"}
+    requests.post(f"{args.base_url}/api/auth/register", json={
+        **credentials,
+        "username": "bench",
+        "user_type": "listener"
+    }).raise_for_status()
+
+    report("idle", measure_vaults(args.base_url, args.requests))
+
+    stop = threading.Event()
+    results = {}
+    loader = threading.Thread(
+        target=login_load,
+        args=(args.base_url, credentials, args.logins_per_sec, stop, results),
+        daemon=True
+    )
+    loader.start()
+    time.sleep(1)  # let the burst ramp up
+    try:
+        report("loaded", measure_vaults(args.base_url, args.requests))
+    finally:
+        stop.set()
+        loader.join()
+
+    print(f"login responses by status: {dict(sorted(results.items()))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Concurrent pledge benchmark against a single hot vault.
+
+Runs N concurrent clients pledging into one vault and checks that the
+vault totals match the pledges that were written (no lost increments).
+
+    python -m backend.benchmarks.pledge_contention --clients 50 --pledges 40
+"""
+from backend.database import Database
+from backend.models import *
+import argparse
+import asyncio
+import os
+import time
+
+
+async def run(clients: int, pledges_per_client: int, amount: float):
+    mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+    db_name = os.environ.get('BENCH_DB_NAME', 'hushhush_bench')
+
+    db = Database(mongo_url, db_name)
+    await db.client.drop_database(db_name)
+
+    try:
+        # Insert fixtures directly; bcrypt is not what we are measuring
+        listener = User(email="bench@example.com", username="bench", password_hash="x", user_type=UserType.LISTENER)
+        await db.db.users.insert_one(listener.dict())
+
+        total = clients * pledges_per_client
+        vault = await db.create_vault(VaultCreate(
+            title="Hot vault",
+            description="Benchmark vault",
+            category=Category.UNHINGED,
+            secret_type=SecretType.TEXT,
+            content="secret",
+            preview="preview",
+            funding_goal=total * amount / 2,
+            duration_days=1
+        ), listener.id)
+
+        async def client():
+            for _ in range(pledges_per_client):
+                await db.create_pledge(PledgeCreate(vault_id=vault.id, amount=amount), listener.id)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+        final = await db.get_vault_by_id(vault.id)
+        pledge_count = await db.db.pledges.count_documents({"vault_id": vault.id})
+
+        print(f"clients={clients} pledges={total} elapsed={elapsed:.3f}s rate={total / elapsed:.0f} pledges/sec")
+        print(f"backers_count={final.backers_count} pledged_amount={final.pledged_amount} "
+              f"pledge_documents={pledge_count} status={final.status.value}")
+
+        lost = total - final.backers_count
+        if lost or final.pledged_amount != total * amount or pledge_count != total:
+            print(f"FAIL: {lost} lost increments")
+            raise SystemExit(1)
+        print("OK: zero lost increments")
+    finally:
+        await db.client.drop_database(db_name)
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--pledges", type=int, default=40, help="pledges per client")
+    parser.add_argument("--amount", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.pledges, args.amount))
@@ -0,0 +1,94 @@
+"""Query latency of the in-process vault search index.
+
+Builds a SearchIndex over synthetic vaults (no Mongo needed) and times a
+mix of full-word, multi-word and typeahead prefix queries, with and
+without filters. Vault text is drawn from a Zipfian vocabulary, like real
+text; --uniform draws every word from a 40-word list instead, so each
+query term matches most of the corpus (a worst case).
+
+    python -m backend.benchmarks.search --vaults 1000000
+    python -m backend.benchmarks.search --vaults 1000000 --uniform
+"""
+from backend.models import *
+from backend.search import SearchIndex
+import argparse
+import asyncio
+import itertools
+import random
+import statistics
+import time
+
+WORDS = ("bollywood wedding scandal producer cricket match fixing corporate layoffs startup founder "
+         "politician election leak celebrity affair divorce influencer brand deal tax raid music label "
+         "award rigged reality show script casting couch stock fraud merger insider trading").split()
+
+QUERIES = [
+    ("bollywood", {}),
+    ("wedding scandal", {}),
+    ("bolly", {}),
+    ("stock fr", {}),
+    ("cricket match fixing", {"status": VaultStatus.LIVE}),
+    ("celebrity", {"category": Category.BOLLYWOOD}),
+    ("influ", {"status": VaultStatus.LIVE, "category": Category.CORPORATE}),
+    ("term1 scandal", {}),
+]
+
+
+def zipf_vocabulary(size: int) -> List[str]:
+    # Filler terms take the most frequent ranks, the queried words sit in the
+    # middle of the distribution, like topical words in real text
+    filler = [f"term{rank}" for rank in range(size - len(WORDS))]
+    return filler[:200] + WORDS + filler[200:]
+
+
+def synthetic_vaults(count: int, vocabulary: List[str], cum_weights: Optional[List[float]]):
+    categories = list(Category)
+    statuses = list(VaultStatus)
+    words = lambda k: random.choices(vocabulary, cum_weights=cum_weights, k=k)
+    for i in range(count):
+        yield {
+            "id": f"vault-{i}",
+            "title": " ".join(words(4)) + f" v{i}",
+            "description": " ".join(words(20)),
+            "preview": " ".join(words(8)),
+            "tags": words(3),
+            "status": random.choice(statuses),
+            "category": random.choice(categories),
+        }
+
+
+async def as_async(items):
+    for item in items:
+        yield item
+
+
+async def run(vaults: int, runs: int, uniform: bool):
+    if uniform:
+        vocabulary, cum_weights = WORDS, None
+    else:
+        vocabulary = zipf_vocabulary(20000)
+        cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    await index.rebuild(as_async(synthetic_vaults(vaults, vocabulary, cum_weights)))
+    print(f"indexed {vaults} vaults in {time.perf_counter() - start:.1f}s ({index.stats()['base_terms']} terms)")
+
+    samples = []
+    for _ in range(runs):
+        query, filters = random.choice(QUERIES)
+        start = time.perf_counter()
+        index.search(query, limit=20, **filters)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    print(f"median={statistics.median(samples):.2f}ms p95={samples[int(runs * 0.95)]:.2f}ms max={samples[-1]:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vaults", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--uniform", action="store_true", help="worst case: every term matches most vaults")
+    args = parser.parse_args()
+    asyncio.run(run(args.vaults, args.runs, args.uniform))
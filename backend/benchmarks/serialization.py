@@ -0,0 +1,89 @@
+"""Serialization cost of a 100-vault listing page, before and after the fast path.
+
+"before" is FastAPI's response_model path: validate the APIResponse
+against the route's response field, run jsonable_encoder, then render a
+JSONResponse. "after" renders the same payload with FastJSONResponse.
+
+    python -m backend.benchmarks.serialization --vaults 100
+"""
+from backend.models import *
+from backend.responses import FastJSONResponse
+from datetime import datetime, timedelta
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+
+def build_page(count: int) -> List[VaultResponse]:
+    now = datetime.utcnow()
+    return [VaultResponse(
+        id=str(uuid.uuid4()),
+        title=f"Vault {i}",
+        description="A reasonably long description of what this vault is about. " * 3,
+        category=Category.BOLLYWOOD,
+        secret_type=SecretType.TEXT,
+        preview="A teaser that is shown on the card before anyone pledges.",
+        cover_image_url=None,
+        whisperer_id=str(uuid.uuid4()),
+        whisperer_username=f"whisperer{i}",
+        funding_goal=10000.0,
+        pledged_amount=1234.5,
+        backers_count=42,
+        duration_days=30,
+        status=VaultStatus.LIVE,
+        is_featured=i % 5 == 0,
+        created_at=now - timedelta(hours=i),
+        deadline=now + timedelta(days=10),
+        unlocked_at=None,
+        content_warnings=["spoilers"],
+        tags=["bollywood", "drama", "insider"],
+        progress_percentage=12.3,
+        time_left="10 days"
+    ) for i in range(count)]
+
+
+async def before(field, page) -> bytes:
+    content = await serialize_response(
+        field=field,
+        response_content=APIResponse(success=True, message="Vaults retrieved successfully", data=page),
+        is_coroutine=True
+    )
+    return JSONResponse(content).body
+
+
+async def after(page) -> bytes:
+    return FastJSONResponse({"success": True, "message": "Vaults retrieved successfully", "data": page}).body
+
+
+async def timed(label: str, func, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    median = statistics.median(samples)
+    print(f"{label:>7}: median={median:8.0f}us p95={sorted(samples)[int(runs * 0.95)]:8.0f}us")
+    return median
+
+
+async def run(vaults: int, runs: int):
+    page = build_page(vaults)
+    field = create_response_field(name="response", type_=APIResponse)
+
+    print(f"{vaults} vaults, {runs} runs")
+    old = await timed("before", lambda: before(field, page), runs)
+    new = await timed("after", lambda: after(page), runs)
+    print(f"speedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vaults", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.vaults, args.runs))
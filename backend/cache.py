@@ -0,0 +1,192 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded in-process cache with per-entry expiry and LRU eviction.
+
+    Not thread-safe; it is meant to be used from the event loop only.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (value, self.clock() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        # Unexpired entries, without touching hit counters or LRU order
+        now = self.clock()
+        return [(key, value) for key, (value, expires_at) in self._entries.items() if expires_at > now]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class RouteCacheConfig:
+    def __init__(self, ttl: float, stale_ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+
+
+class ResponseCache:
+    """Per-route response cache with stale-while-revalidate and single-flight refresh.
+
+    Entries younger than ``ttl`` are served as hits. Entries within the
+    following ``stale_ttl`` seconds are served immediately while one
+    background task refreshes them. Concurrent misses for the same key
+    share a single computation. ``invalidate`` drops a route's entries
+    and discards any refresh that started before it.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._configs: Dict[str, RouteCacheConfig] = {}
+        self._entries: Dict[str, "OrderedDict[tuple, tuple]"] = {}
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._generations: Dict[str, int] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def configure(self, route: str, ttl: float, stale_ttl: float = 0.0, maxsize: int = 1000):
+        self._configs[route] = RouteCacheConfig(ttl, stale_ttl, maxsize)
+        self._entries[route] = OrderedDict()
+        self._generations[route] = 0
+        self._counters[route] = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+
+    @staticmethod
+    def make_key(route: str, params: Dict[str, Any]) -> tuple:
+        # Normalize query params so equivalent requests share an entry
+        return (route, tuple(sorted((name, str(value)) for name, value in params.items() if value is not None)))
+
+    async def get_or_compute(self,
+                             route: str,
+                             params: Dict[str, Any],
+                             compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, str, float]:
+        """Return ``(value, cache_status, age_seconds)``; status is HIT, STALE or MISS."""
+        config = self._configs[route]
+        counters = self._counters[route]
+        entries = self._entries[route]
+        key = self.make_key(route, params)
+
+        entry = entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = self.clock() - stored_at
+            if age < config.ttl:
+                entries.move_to_end(key)
+                counters["hits"] += 1
+                return value, "HIT", age
+            if age < config.ttl + config.stale_ttl:
+                entries.move_to_end(key)
+                counters["stale_hits"] += 1
+                self._start_refresh(route, key, compute)
+                return value, "STALE", age
+
+        counters["misses"] += 1
+        value = await asyncio.shield(self._start_refresh(route, key, compute))
+        return value, "MISS", 0.0
+
+    def invalidate(self, *routes: str):
+        for route in routes:
+            if route in self._configs:
+                self._entries[route].clear()
+                self._generations[route] += 1
+
+    def _start_refresh(self, route: str, key: tuple, compute: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        # Refreshes started before an invalidation are not shared with later callers
+        generation = self._generations[route]
+        inflight_key = (key, generation)
+        refresh = self._inflight.get(inflight_key)
+        if refresh is None:
+            refresh = asyncio.ensure_future(self._refresh(route, key, compute, generation))
+            self._inflight[inflight_key] = refresh
+            refresh.add_done_callback(lambda task: self._finish_refresh(route, inflight_key, task))
+        return refresh
+
+    async def _refresh(self, route: str, key: tuple, compute: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        value = await compute()
+
+        # Only store if nothing invalidated the route since the refresh was started
+        if generation == self._generations[route]:
+            entries = self._entries[route]
+            entries[key] = (value, self.clock())
+            entries.move_to_end(key)
+            while len(entries) > self._configs[route].maxsize:
+                entries.popitem(last=False)
+        return value
+
+    def _finish_refresh(self, route: str, inflight_key: tuple, task: asyncio.Future):
+        self._inflight.pop(inflight_key, None)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self._counters[route]["refresh_errors"] += 1
+            logger.warning(f"Response cache refresh failed for {route}: {task.exception()}")
+        else:
+            self._counters[route]["refreshes"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        now = self.clock()
+        stats = {}
+        for route, config in self._configs.items():
+            entries = self._entries[route]
+            stats[route] = {
+                **self._counters[route],
+                "entries": len(entries),
+                "ttl": config.ttl,
+                "stale_ttl": config.stale_ttl,
+                "oldest_age": round(max((now - stored_at for _, stored_at in entries.values()), default=0.0), 3)
+            }
+        return stats
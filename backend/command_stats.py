@@ -0,0 +1,86 @@
+from contextvars import ContextVar
+from pymongo import monitoring
+from typing import Any, Dict, Optional
+import threading
+
+
+class RequestCommands:
+    """Mongo commands issued by one request."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()  # Motor runs commands on executor threads
+
+    def increment(self):
+        with self._lock:
+            self.count += 1
+
+
+current_request: ContextVar[Optional[RequestCommands]] = ContextVar("current_request", default=None)
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Attributes every Mongo command to the request whose context issued it.
+
+    Motor copies the caller's context onto its executor threads, so
+    ``current_request`` is visible here. Commands issued outside a request
+    (startup, schedulers) are not counted.
+    """
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        commands = current_request.get()
+        if commands is not None:
+            commands.increment()
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        pass
+
+
+class CommandStats:
+    """Process-wide totals of Mongo commands per HTTP request."""
+
+    def __init__(self):
+        self.requests = 0
+        self.commands = 0
+        self.max_commands = 0
+
+    def record(self, commands: RequestCommands):
+        self.requests += 1
+        self.commands += commands.count
+        self.max_commands = max(self.max_commands, commands.count)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "commands": self.commands,
+            "max_commands": self.max_commands,
+            "commands_per_request": round(self.commands / self.requests, 3) if self.requests else 0.0
+        }
+
+
+class CommandStatsMiddleware:
+    """ASGI middleware giving each HTTP request its own command tally.
+
+    Plain ASGI rather than BaseHTTPMiddleware, so the tally also covers
+    commands issued while a streamed response body is being sent.
+    """
+
+    def __init__(self, app, stats: CommandStats):
+        self.app = app
+        self.stats = stats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        commands = RequestCommands()
+        token = current_request.set(commands)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request.reset(token)
+            self.stats.record(commands)
@@ -1,32 +1,150 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from bson import ObjectId
+from gridfs.errors import NoFile
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+import asyncio
 import os
-from typing import List, Optional, Dict, Any
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 from backend.models import *
+from backend.auth import password_hasher
+from backend.cache import TTLCache
+from backend.command_stats import CommandCounter
+from backend.audio import AUDIO_BUCKET, AUDIO_CHUNK_SIZE
+from backend.indexes import apply_indexes
+from backend.search import SearchIndex
+from backend.facets import FACET_FIELDS, FacetCache, counts_from_facets, facet_pipeline, filter_key
 from datetime import datetime, timedelta
+import base64
 import bcrypt
 import jwt
-from passlib.context import CryptContext
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Vault cards: VaultResponse-shaped documents with the derived fields computed by Mongo
+MS_PER_HOUR = 3600 * 1000
+MS_PER_DAY = 24 * MS_PER_HOUR
+VAULT_CARD_STAGE = {"$project": {
+    "_id": 0,
+    **{
+        field: 1 for field in VaultResponse.model_fields
+        if field not in ("whisperer_username", "comments_count", "progress_percentage", "time_left")
+    },
+    "comments_count": {"$ifNull": ["$comments_count", 0]},
+    "progress_percentage": {"$cond": [
+        {"$gt": ["$funding_goal", 0]},
+        {"$round": [{"$multiply": [{"$divide": ["$pledged_amount", "$funding_goal"]}, 100]}, 1]},
+        0.0
+    ]},
+    # Mirrors Database._calculate_time_left
+    "time_left": {"$let": {
+        "vars": {"ms_left": {"$subtract": ["$deadline", "$$NOW"]}},
+        "in": {"$switch": {
+            "branches": [
+                {"case": {"$lte": ["$$ms_left", 0]}, "then": "Expired"},
+                {"case": {"$gte": ["$$ms_left", MS_PER_DAY]}, "then": {"$concat": [
+                    {"$toString": {"$toLong": {"$floor": {"$divide": ["$$ms_left", MS_PER_DAY]}}}}, " days"
+                ]}},
+                {"case": {"$gte": ["$$ms_left", MS_PER_HOUR]}, "then": {"$concat": [
+                    {"$toString": {"$toLong": {"$floor": {"$divide": ["$$ms_left", MS_PER_HOUR]}}}}, " hours"
+                ]}}
+            ],
+            "default": "Less than 1 hour"
+        }}
+    }}
+}}
+
+# Whisperer profile cache settings
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+PROFILE_CACHE_TTL_SECONDS = int(os.getenv("PROFILE_CACHE_TTL_SECONDS", "300"))
+PROFILE_PROJECTION = {"_id": 0, "id": 1, "username": 1, "is_verified": 1, "credibility_score": 1}
+
+# Read projections: only the content route ever fetches the secret content
+VAULT_LISTING_PROJECTION = {"_id": 0, "content": 0}
+VAULT_TITLE_PROJECTION = {"_id": 0, "id": 1, "title": 1, "status": 1, "whisperer_id": 1}  # What a pledge shows of its vault
+VAULT_CONTENT_PROJECTION = {
+    "_id": 0, "id": 1, "status": 1, "whisperer_id": 1, "secret_type": 1, "content": 1, "audio_file_id": 1
+}
+
+# Fields the in-process search index reads; a change to any of them reindexes the vault
+SEARCH_FIELDS = ["id", "title", "description", "preview", "tags", "status", "category"]
+
+# Platform counters: one document kept current with $inc on every state change
+PLATFORM_COUNTERS_ID = "platform"
+LISTING_VERSION_FIELD = "listing_version"  # Bumped whenever any vault card changes; drives listing ETags
+VAULT_COUNTER_FIELDS = ["total_vaults", "live_vaults", "funded_vaults", "total_pledged"]
+USER_COUNTER_FIELDS = ["total_users", "total_whisperers", "total_listeners", "verified_users"]
+
+def user_counters(user_type: Optional[str], is_verified: bool) -> Dict[str, int]:
+    # A user's contribution to the platform counters
+    return {
+        "total_whisperers": int(user_type in [UserType.WHISPERER, UserType.BOTH]),
+        "total_listeners": int(user_type in [UserType.LISTENER, UserType.BOTH]),
+        "verified_users": int(bool(is_verified))
+    }
+
+def vault_status_counters(status: Optional[str]) -> Dict[str, int]:
+    # A vault status' contribution to the platform counters
+    return {
+        "live_vaults": int(status == VaultStatus.LIVE),
+        "funded_vaults": int(status in [VaultStatus.FUNDED, VaultStatus.UNLOCKED])
+    }
+
+def counter_delta(before: Dict[str, float], after: Dict[str, float]) -> Dict[str, float]:
+    return {key: after[key] - before.get(key, 0) for key in after}
+
+# Deadline settlement: funded vaults capture their pledges, the rest refund them
+CAPTURE_STATUSES = [VaultStatus.FUNDED, VaultStatus.UNLOCKED]
+REFUND_STATUSES = [VaultStatus.EXPIRED, VaultStatus.CANCELLED]
+
+# Pledges are only accepted before the deadline, on vaults that are still open
+PLEDGEABLE_STATUSES = [VaultStatus.LIVE, VaultStatus.FUNDED]
+# Settlement waits this long past the deadline so a pledge admitted just
+# before it has been inserted by the time its vault's pledges are swept
+SETTLEMENT_GRACE = timedelta(seconds=int(os.getenv("SETTLEMENT_GRACE_SECONDS", "60")))
+
+def pledgeable_filter(now: datetime) -> Dict[str, Any]:
+    return {"status": {"$in": PLEDGEABLE_STATUSES}, "deadline": {"$gt": now}}
+
+# Cursor pagination
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, item_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), item_id
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+def cursor_filter(cursor: str) -> Dict[str, Any]:
+    # Matches everything strictly after the cursor in (created_at, id) descending order
+    created_at, item_id = decode_cursor(cursor)
+    return {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "id": {"$lt": item_id}}
+    ]}
 
 class Database:
     def __init__(self, mongo_url: str, db_name: str):
-        self.client = AsyncIOMotorClient(mongo_url)
+        self.client = AsyncIOMotorClient(mongo_url, event_listeners=[CommandCounter()])
         self.db = self.client[db_name]
+        self.audio_bucket = AsyncIOMotorGridFSBucket(self.db, bucket_name=AUDIO_BUCKET)
+        # user id -> public profile fragment, shared by every request in the process
+        self.profile_cache = TTLCache(PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL_SECONDS)
+        self.search_index = SearchIndex()
+        self.facet_cache = FacetCache()
         
     async def close(self):
         self.client.close()
     
+    async def ensure_indexes(self):
+        await apply_indexes(self.db)
+    
     # User operations
     async def create_user(self, user_data: UserCreate) -> User:
-        # Check if user exists
-        existing_user = await self.db.users.find_one({"email": user_data.email})
-        if existing_user:
-            raise ValueError("User with this email already exists")
-        
         # Hash password
-        password_hash = pwd_context.hash(user_data.password)
+        password_hash = await password_hasher.hash(user_data.password)
         
         # Create user
         user = User(
@@ -38,7 +156,13 @@ class Database:
             referred_by=user_data.referred_by
         )
         
-        await self.db.users.insert_one(user.dict())
+        # The unique email index rejects duplicates
+        try:
+            await self.db.users.insert_one(user.dict())
+        except DuplicateKeyError:
+            raise ValueError("User with this email already exists")
+        
+        await self._bump_counters({"total_users": 1, **user_counters(user.user_type, user.is_verified)})
         return user
     
     async def authenticate_user(self, email: str, password: str) -> Optional[User]:
@@ -46,7 +170,7 @@ class Database:
         if not user_data:
             return None
         
-        if not pwd_context.verify(password, user_data["password_hash"]):
+        if not await password_hasher.verify(password, user_data["password_hash"]):
             return None
         
         return User(**user_data)
@@ -55,17 +179,45 @@ class Database:
         user_data = await self.db.users.find_one({"id": user_id})
         return User(**user_data) if user_data else None
     
+    async def get_users_by_ids(self, user_ids: List[str]) -> Dict[str, User]:
+        cursor = self.db.users.find({"id": {"$in": user_ids}}, {"_id": 0})
+        return {document["id"]: User(**document) async for document in cursor}
+    
     async def get_user_by_email(self, email: str) -> Optional[User]:
         user_data = await self.db.users.find_one({"email": email})
         return User(**user_data) if user_data else None
     
     async def update_user(self, user_id: str, update_data: Dict[str, Any]) -> bool:
         update_data["updated_at"] = datetime.utcnow()
-        result = await self.db.users.update_one(
-            {"id": user_id}, 
-            {"$set": update_data}
+        
+        if not any(field in update_data for field in ("user_type", "is_verified", "username")):
+            result = await self.db.users.update_one(
+                {"id": user_id}, 
+                {"$set": update_data}
+            )
+            self.profile_cache.pop(user_id)
+            return result.modified_count > 0
+        
+        # Counter- or card-relevant change: the pre-image tells us what to adjust
+        before = await self.db.users.find_one_and_update(
+            {"id": user_id},
+            {"$set": update_data},
+            projection={"_id": 0, "user_type": 1, "is_verified": 1, "username": 1}
         )
-        return result.modified_count > 0
+        self.profile_cache.pop(user_id)
+        if not before:
+            return False
+        
+        after = {**before, **update_data}
+        deltas = counter_delta(
+            user_counters(before.get("user_type"), before.get("is_verified", False)),
+            user_counters(after.get("user_type"), after.get("is_verified", False))
+        )
+        # Vault cards show the whisperer's username
+        if after.get("username") != before.get("username"):
+            deltas[LISTING_VERSION_FIELD] = 1
+        await self._bump_counters(deltas)
+        return True
     
     # Vault operations
     async def create_vault(self, vault_data: VaultCreate, whisperer_id: str) -> Vault:
@@ -86,93 +238,220 @@ class Database:
         )
         
         await self.db.vaults.insert_one(vault.dict())
+        await self._bump_counters({"total_vaults": 1, LISTING_VERSION_FIELD: 1, **vault_status_counters(vault.status)})
+        self.search_index.add(vault.dict())
+        self.facet_cache.apply(None, vault.dict())
         return vault
     
     async def get_vault_by_id(self, vault_id: str) -> Optional[Vault]:
         vault_data = await self.db.vaults.find_one({"id": vault_id})
         return Vault(**vault_data) if vault_data else None
     
+    async def get_vault_content(self, vault_id: str) -> Optional[Dict[str, Any]]:
+        return await self.db.vaults.find_one({"id": vault_id}, VAULT_CONTENT_PROJECTION)
+    
     async def get_vaults(self, 
                         status: Optional[VaultStatus] = None,
                         category: Optional[Category] = None,
                         featured: Optional[bool] = None,
                         limit: int = 20,
-                        skip: int = 0) -> List[Vault]:
-        query = {}
-        if status:
-            query["status"] = status
-        if category:
-            query["category"] = category
-        if featured is not None:
-            query["is_featured"] = featured
+                        skip: int = 0,
+                        cursor: Optional[str] = None) -> List[VaultSummary]:
+        query = self._vault_query(status, category, featured, cursor)
         
-        cursor = self.db.vaults.find(query).sort("created_at", -1).skip(skip).limit(limit)
-        vaults = await cursor.to_list(length=limit)
-        return [Vault(**vault) for vault in vaults]
+        vault_cursor = self.db.vaults.find(query, VAULT_LISTING_PROJECTION) \
+            .sort([("created_at", -1), ("id", -1)]).skip(skip).limit(limit)
+        vaults = await vault_cursor.to_list(length=limit)
+        return [VaultSummary(**vault) for vault in vaults]
     
     async def get_vault_responses(self, 
                                 status: Optional[VaultStatus] = None,
                                 category: Optional[Category] = None,
                                 featured: Optional[bool] = None,
                                 limit: int = 20,
-                                skip: int = 0) -> List[VaultResponse]:
-        vaults = await self.get_vaults(status, category, featured, limit, skip)
-        responses = []
+                                skip: int = 0) -> List[Dict[str, Any]]:
+        return await self._get_vault_cards(self._vault_query(status, category, featured), limit, skip)
+    
+    async def get_vault_page(self,
+                             status: Optional[VaultStatus] = None,
+                             category: Optional[Category] = None,
+                             featured: Optional[bool] = None,
+                             limit: int = 20,
+                             cursor: Optional[str] = None) -> CursorPage:
+        # Keyset pagination: stable under concurrent inserts and independent of scroll depth
+        cards = await self._get_vault_cards(self._vault_query(status, category, featured, cursor), limit + 1)
+        return self._cursor_page(cards, limit)
+    
+    async def get_vault_version(self, vault_id: str) -> Optional[Dict[str, Any]]:
+        # Just enough to build the vault's ETag
+        return await self.db.vaults.find_one({"id": vault_id}, {"_id": 0, "version": 1, "deadline": 1, "whisperer_id": 1})
+    
+    async def get_listing_version(self) -> int:
+        counters = await self.db.platform_counters.find_one({"_id": PLATFORM_COUNTERS_ID}, {LISTING_VERSION_FIELD: 1})
+        return (counters or {}).get(LISTING_VERSION_FIELD, 0)
+    
+    async def get_vault_response(self, vault_id: str) -> Optional[Dict[str, Any]]:
+        cards = await self._get_vault_cards({"id": vault_id}, 1)
+        return cards[0] if cards else None
+    
+    async def get_live_vault_cards(self, limit: int) -> List[Dict[str, Any]]:
+        return await self._get_vault_cards({"status": VaultStatus.LIVE}, limit)
+    
+    async def update_vault(self, vault_id: str, update_data: Dict[str, Any]) -> bool:
+        if not update_data:
+            return False
         
-        for vault in vaults:
-            # Get whisperer info
-            whisperer = await self.get_user_by_id(vault.whisperer_id)
-            
-            # Calculate progress and time left
-            progress_percentage = (vault.pledged_amount / vault.funding_goal) * 100
-            time_left = self._calculate_time_left(vault.deadline)
+        # Only match when some field actually changes, so a no-op write
+        # neither bumps the version nor reports a modification
+        query = {"id": vault_id, "$or": [{key: {"$ne": value}} for key, value in update_data.items()]}
+        if "pledged_amount" not in update_data and not any(field in update_data for field in FACET_FIELDS):
+            result = await self.db.vaults.update_one(
+                query, 
+                {"$set": update_data, "$inc": {"version": 1}}
+            )
+            if result.modified_count:
+                await self._bump_counters({LISTING_VERSION_FIELD: 1})
+                await self._reindex_vault(vault_id, update_data)
+            return result.modified_count > 0
+        
+        # Counter- or facet-relevant change: the pre-image tells us what to adjust
+        before = await self.db.vaults.find_one_and_update(
+            query,
+            {"$set": update_data, "$inc": {"version": 1}},
+            projection={"_id": 0, **{key: 1 for key in update_data}, **{field: 1 for field in FACET_FIELDS}}
+        )
+        if not before:
+            return False
+        
+        after = {**before, **update_data}
+        deltas = counter_delta(vault_status_counters(before.get("status")), vault_status_counters(after.get("status")))
+        deltas["total_pledged"] = after.get("pledged_amount", 0) - before.get("pledged_amount", 0)
+        deltas[LISTING_VERSION_FIELD] = 1
+        await self._bump_counters(deltas)
+        self.facet_cache.apply(before, after)
+        await self._reindex_vault(vault_id, update_data)
+        return True
+    
+    async def expire_vaults(self, now: datetime, batch_size: int = 500) -> int:
+        # LIVE vaults past their deadline never reached the goal; returns vaults expired
+        expired = 0
+        while True:
+            ids = [vault["id"] async for vault in self.db.vaults.find(
+                {"status": VaultStatus.LIVE, "deadline": {"$lte": now}}, {"_id": 0, "id": 1}
+            ).limit(batch_size)]
+            if not ids:
+                break
             
-            response = VaultResponse(
-                id=vault.id,
-                title=vault.title,
-                description=vault.description,
-                category=vault.category,
-                secret_type=vault.secret_type,
-                preview=vault.preview,
-                cover_image_url=vault.cover_image_url,
-                whisperer_id=vault.whisperer_id,
-                whisperer_username=whisperer.username if whisperer else "Unknown",
-                funding_goal=vault.funding_goal,
-                pledged_amount=vault.pledged_amount,
-                backers_count=vault.backers_count,
-                duration_days=vault.duration_days,
-                status=vault.status,
-                is_featured=vault.is_featured,
-                created_at=vault.created_at,
-                deadline=vault.deadline,
-                unlocked_at=vault.unlocked_at,
-                content_warnings=vault.content_warnings,
-                tags=vault.tags,
-                progress_percentage=round(progress_percentage, 1),
-                time_left=time_left
+            # The status guard loses cleanly to a pledge that funded the vault meanwhile
+            result = await self.db.vaults.update_many(
+                {"id": {"$in": ids}, "status": VaultStatus.LIVE},
+                {"$set": {"status": VaultStatus.EXPIRED}, "$inc": {"version": 1}}
             )
-            responses.append(response)
+            expired += result.modified_count
+            if result.modified_count:
+                await self._reindex_status(ids, VaultStatus.EXPIRED)
+            await self._bump_counters({
+                LISTING_VERSION_FIELD: int(result.modified_count > 0),
+                **{
+                    field: delta * result.modified_count
+                    for field, delta in counter_delta(
+                        vault_status_counters(VaultStatus.LIVE), vault_status_counters(VaultStatus.EXPIRED)
+                    ).items()
+                }
+            })
+            if len(ids) < batch_size:
+                break
         
-        return responses
+        # Which vaults moved is unknown after update_many; recompute facets on next read
+        if expired:
+            self.facet_cache.clear()
+        return expired
     
-    async def update_vault(self, vault_id: str, update_data: Dict[str, Any]) -> bool:
-        result = await self.db.vaults.update_one(
-            {"id": vault_id}, 
-            {"$set": update_data}
-        )
-        return result.modified_count > 0
+    async def settle_vaults(self, now: datetime, batch_size: int = 500) -> Dict[str, int]:
+        # Capture or refund the authorized pledges of every vault whose deadline has passed
+        settled = {"vaults": 0, "captured": 0, "refunded": 0}
+        cutoff = now - SETTLEMENT_GRACE
+        while True:
+            vaults = await self.db.vaults.find(
+                {"status": {"$in": CAPTURE_STATUSES + REFUND_STATUSES}, "deadline": {"$lte": cutoff}, "settled_at": None},
+                {"_id": 0, "id": 1, "status": 1}
+            ).limit(batch_size).to_list(batch_size)
+            if not vaults:
+                break
+            
+            capture_ids = [vault["id"] for vault in vaults if vault["status"] in CAPTURE_STATUSES]
+            refund_ids = [vault["id"] for vault in vaults if vault["status"] in REFUND_STATUSES]
+            if capture_ids:
+                result = await self.db.pledges.update_many(
+                    {"vault_id": {"$in": capture_ids}, "status": "authorized"},
+                    {"$set": {"status": "captured", "captured_at": now}}
+                )
+                settled["captured"] += result.modified_count
+            if refund_ids:
+                result = await self.db.pledges.update_many(
+                    {"vault_id": {"$in": refund_ids}, "status": "authorized"},
+                    {"$set": {"status": "refunded", "refunded_at": now}}
+                )
+                settled["refunded"] += result.modified_count
+            
+            result = await self.db.vaults.update_many(
+                {"id": {"$in": capture_ids + refund_ids}, "settled_at": None},
+                {"$set": {"settled_at": now}}
+            )
+            settled["vaults"] += result.modified_count
+            if len(vaults) < batch_size:
+                break
+        return settled
+    
+    async def get_user_vaults(self,
+                              user_id: str,
+                              status: Optional[VaultStatus] = None,
+                              limit: int = 20,
+                              cursor: Optional[str] = None) -> CursorPage:
+        query: Dict[str, Any] = {"whisperer_id": user_id}
+        if status:
+            query["status"] = status
+        if cursor:
+            query.update(cursor_filter(cursor))
+        
+        cards = await self._get_vault_cards(query, limit + 1)
+        return self._cursor_page(cards, limit)
     
-    async def get_user_vaults(self, user_id: str, limit: int = 20) -> List[VaultResponse]:
-        vaults = await self.get_vaults(limit=limit)
-        # Filter vaults where user is whisperer
-        user_vaults = [v for v in vaults if v.whisperer_id == user_id]
-        return await self._convert_to_vault_responses(user_vaults)
+    async def get_whisperer_vault_summary(self, user_id: str) -> Dict[str, Any]:
+        pipeline = [
+            {"$match": {"whisperer_id": user_id}},
+            {"$group": {
+                "_id": None,
+                "total_earned": {"$sum": {"$cond": [
+                    {"$eq": ["$status", VaultStatus.UNLOCKED]},
+                    {"$multiply": ["$pledged_amount", 0.9]},
+                    0.0
+                ]}},
+                "active_vaults": {"$sum": {"$cond": [{"$eq": ["$status", VaultStatus.LIVE]}, 1, 0]}},
+                "total_vaults": {"$sum": 1}
+            }}
+        ]
+        result = await self.db.vaults.aggregate(pipeline).to_list(1)
+        if not result:
+            return {"total_earned": 0.0, "active_vaults": 0, "total_vaults": 0}
+        
+        summary = result[0]
+        summary.pop("_id")
+        return summary
     
     # Pledge operations
     async def create_pledge(self, pledge_data: PledgeCreate, user_id: str) -> Pledge:
-        # Check if vault exists
-        vault = await self.get_vault_by_id(pledge_data.vault_id)
+        # Apply the pledge to the vault totals atomically; this also checks the
+        # vault exists and is still open for pledges
+        vault = await self.db.vaults.find_one_and_update(
+            {"id": pledge_data.vault_id, **pledgeable_filter(datetime.utcnow())},
+            {"$inc": {"pledged_amount": pledge_data.amount, "backers_count": 1, "version": 1}},
+            projection={"_id": 0, "pledged_amount": 1, "funding_goal": 1, **{field: 1 for field in FACET_FIELDS}},
+            return_document=ReturnDocument.AFTER
+        )
         if not vault:
+            if await self.db.vaults.find_one({"id": pledge_data.vault_id}, {"_id": 1}):
+                raise ValueError("Vault is no longer accepting pledges")
             raise ValueError("Vault not found")
         
         # Calculate referral credit
@@ -186,103 +465,464 @@ class Database:
             referral_credit_earned=referral_credit
         )
         
-        # Insert pledge
-        await self.db.pledges.insert_one(pledge.dict())
-        
-        # Update vault pledged amount and backers count
-        await self.update_vault(pledge_data.vault_id, {
-            "pledged_amount": vault.pledged_amount + pledge_data.amount,
-            "backers_count": vault.backers_count + 1
-        })
+        # Insert pledge; if that fails, take it back out of the vault totals
+        try:
+            await self.db.pledges.insert_one(pledge.dict())
+        except Exception:
+            await self.db.vaults.update_one(
+                {"id": pledge_data.vault_id},
+                {"$inc": {"pledged_amount": -pledge_data.amount, "backers_count": -1, "version": 1}}
+            )
+            raise
         
-        # Check if funding goal is reached
-        if vault.pledged_amount + pledge_data.amount >= vault.funding_goal:
-            await self.update_vault(pledge_data.vault_id, {
-                "status": VaultStatus.FUNDED
-            })
+        # Flip to FUNDED once the goal is reached; the status guard makes the
+        # transition happen exactly once even when pledges race past the goal
+        deltas = {"total_pledged": pledge_data.amount, LISTING_VERSION_FIELD: 1}
+        if vault["status"] == VaultStatus.LIVE and vault["pledged_amount"] >= vault["funding_goal"]:
+            result = await self.db.vaults.update_one(
+                {"id": pledge_data.vault_id, "status": VaultStatus.LIVE},
+                {"$set": {"status": VaultStatus.FUNDED}, "$inc": {"version": 1}}
+            )
+            if result.modified_count:
+                deltas.update(counter_delta(
+                    vault_status_counters(VaultStatus.LIVE),
+                    vault_status_counters(VaultStatus.FUNDED)
+                ))
+                self.facet_cache.apply(vault, {**vault, "status": VaultStatus.FUNDED})
+                self.search_index.set_status(pledge_data.vault_id, VaultStatus.FUNDED)
+        await self._bump_counters(deltas)
         
         return pledge
     
-    async def get_user_pledges(self, user_id: str) -> List[PledgeResponse]:
-        cursor = self.db.pledges.find({"user_id": user_id}).sort("created_at", -1)
-        pledges = await cursor.to_list(length=100)
+    async def create_pledges_bulk(self, items: List[BulkPledgeItem]) -> List[BulkPledgeResult]:
+        # Validate against one $in read per collection instead of a lookup per item
+        vault_ids = list({item.vault_id for item in items})
+        user_ids = list({item.user_id for item in items})
+        now = datetime.utcnow()
+        vaults = {
+            vault["id"]: vault["status"] in PLEDGEABLE_STATUSES and vault["deadline"] > now
+            async for vault in self.db.vaults.find({"id": {"$in": vault_ids}}, {"_id": 0, "id": 1, "status": 1, "deadline": 1})
+        }
+        listeners = {user["id"] async for user in self.db.users.find(
+            {"id": {"$in": user_ids}, "user_type": {"$in": [UserType.LISTENER, UserType.BOTH]}},
+            {"_id": 0, "id": 1}
+        )}
         
-        responses = []
-        for pledge_data in pledges:
-            pledge = Pledge(**pledge_data)
-            vault = await self.get_vault_by_id(pledge.vault_id)
-            
-            response = PledgeResponse(
-                id=pledge.id,
-                vault_id=pledge.vault_id,
-                vault_title=vault.title if vault else "Unknown",
-                amount=pledge.amount,
-                status=pledge.status,
-                referral_credit_earned=pledge.referral_credit_earned,
-                created_at=pledge.created_at
-            )
-            responses.append(response)
+        results = [BulkPledgeResult(index=index) for index in range(len(items))]
+        pledges: List[Tuple[int, Pledge]] = []
+        for index, item in enumerate(items):
+            if item.amount <= 0:
+                results[index].error = "Amount must be positive"
+            elif item.vault_id not in vaults:
+                results[index].error = "Vault not found"
+            elif not vaults[item.vault_id]:
+                results[index].error = "Vault is no longer accepting pledges"
+            elif item.user_id not in listeners:
+                results[index].error = "User not found or not a listener"
+            else:
+                pledges.append((index, Pledge(
+                    vault_id=item.vault_id,
+                    user_id=item.user_id,
+                    amount=item.amount,
+                    referrer_id=item.referrer_id,
+                    referral_credit_earned=item.amount * 0.05 if item.referrer_id else 0.0
+                )))
+        if not pledges:
+            return results
         
-        return responses
+        # Unordered insert: one bad document does not stop the rest of the batch
+        failed = {}
+        try:
+            await self.db.pledges.insert_many([pledge.dict() for _, pledge in pledges], ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"]: error["errmsg"] for error in e.details.get("writeErrors", [])}
+        
+        # Fold the inserted pledges into one $inc per vault
+        vault_deltas: Dict[str, Dict[str, float]] = {}
+        for position, (index, pledge) in enumerate(pledges):
+            if position in failed:
+                results[index].error = failed[position]
+                continue
+            results[index].pledge_id = pledge.id
+            delta = vault_deltas.setdefault(pledge.vault_id, {"pledged_amount": 0.0, "backers_count": 0, "version": 1})
+            delta["pledged_amount"] += pledge.amount
+            delta["backers_count"] += 1
+        if not vault_deltas:
+            return results
+        
+        await self.db.vaults.bulk_write(
+            [UpdateOne({"id": vault_id}, {"$inc": delta}) for vault_id, delta in vault_deltas.items()],
+            ordered=False
+        )
+        
+        # Same guarded LIVE -> FUNDED transition as create_pledge, for every touched vault at once
+        funded = await self.db.vaults.update_many(
+            {
+                "id": {"$in": list(vault_deltas)},
+                "status": VaultStatus.LIVE,
+                "$expr": {"$gte": ["$pledged_amount", "$funding_goal"]}
+            },
+            {"$set": {"status": VaultStatus.FUNDED}, "$inc": {"version": 1}}
+        )
+        
+        deltas = {"total_pledged": sum(delta["pledged_amount"] for delta in vault_deltas.values()), LISTING_VERSION_FIELD: 1}
+        transition = counter_delta(vault_status_counters(VaultStatus.LIVE), vault_status_counters(VaultStatus.FUNDED))
+        for field, delta in transition.items():
+            deltas[field] = delta * funded.modified_count
+        await self._bump_counters(deltas)
+        if funded.modified_count:
+            self.facet_cache.clear()
+            await self._reindex_status(list(vault_deltas), VaultStatus.FUNDED)
+        
+        return results
+    
+    async def get_recent_pledge_totals(self, hour_start: datetime, day_start: datetime) -> Dict[str, Tuple[float, float]]:
+        # Amount pledged per vault since each window start, in one pass over the day's pledges
+        pipeline = [
+            {"$match": {"created_at": {"$gte": day_start}}},
+            {"$group": {
+                "_id": "$vault_id",
+                "hour": {"$sum": {"$cond": [{"$gte": ["$created_at", hour_start]}, "$amount", 0]}},
+                "day": {"$sum": "$amount"}
+            }}
+        ]
+        return {row["_id"]: (row["hour"], row["day"]) async for row in self.db.pledges.aggregate(pipeline)}
+    
+    async def get_user_pledges(self, user_id: str, limit: int = 20, cursor: Optional[str] = None) -> CursorPage:
+        query: Dict[str, Any] = {"user_id": user_id}
+        if cursor:
+            query.update(cursor_filter(cursor))
+        
+        # Resolve vault titles server-side so the page costs a single round trip
+        pipeline = [
+            {"$match": query},
+            {"$sort": {"created_at": -1, "id": -1}},
+            {"$limit": limit + 1},
+            {"$lookup": {
+                "from": "vaults",
+                "localField": "vault_id",
+                "foreignField": "id",
+                "pipeline": [{"$project": VAULT_TITLE_PROJECTION}],
+                "as": "vault"
+            }},
+            {"$project": {
+                "_id": 0,
+                "id": 1,
+                "vault_id": 1,
+                "vault_title": {"$ifNull": [{"$arrayElemAt": ["$vault.title", 0]}, "Unknown"]},
+                "amount": 1,
+                "status": 1,
+                "referral_credit_earned": 1,
+                "created_at": 1
+            }}
+        ]
+        pledges = await self.db.pledges.aggregate(pipeline).to_list(length=limit + 1)
+        
+        return self._cursor_page(pledges, limit, PledgeResponse)
+    
+    async def get_user_pledge_summary(self, user_id: str) -> Dict[str, Any]:
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {"$group": {
+                "_id": None,
+                "total_pledged": {"$sum": "$amount"},
+                "active_pledges": {"$sum": {"$cond": [{"$eq": ["$status", "authorized"]}, 1, 0]}},
+                "total_pledges": {"$sum": 1},
+                "referral_credits": {"$sum": "$referral_credit_earned"}
+            }}
+        ]
+        result = await self.db.pledges.aggregate(pipeline).to_list(1)
+        if not result:
+            return {"total_pledged": 0.0, "active_pledges": 0, "total_pledges": 0, "referral_credits": 0.0}
+        
+        summary = result[0]
+        summary.pop("_id")
+        return summary
+    
+    async def has_pledged(self, user_id: str, vault_id: str) -> bool:
+        pledge = await self.db.pledges.find_one({"user_id": user_id, "vault_id": vault_id}, {"_id": 1})
+        return pledge is not None
     
     # Comment operations
-    async def create_comment(self, comment_data: CommentCreate, user_id: str) -> Comment:
-        user = await self.get_user_by_id(user_id)
-        if not user:
-            raise ValueError("User not found")
+    async def create_comment(self, comment_data: CommentCreate, user_id: str, username: Optional[str] = None) -> Comment:
+        # Callers that already hold the user can pass the username and skip the lookup
+        if username is None:
+            user = await self.get_user_by_id(user_id)
+            if not user:
+                raise ValueError("User not found")
+            username = user.username
+        
+        # Keep the denormalized count on the vault; this also checks the vault exists
+        result = await self.db.vaults.update_one(
+            {"id": comment_data.vault_id},
+            {"$inc": {"comments_count": 1, "version": 1}}
+        )
+        if not result.matched_count:
+            raise ValueError("Vault not found")
+        await self._bump_counters({LISTING_VERSION_FIELD: 1})
         
         comment = Comment(
             vault_id=comment_data.vault_id,
             user_id=user_id,
-            username=user.username,
+            username=username,
             content=comment_data.content
         )
         
         await self.db.comments.insert_one(comment.dict())
         return comment
     
-    async def get_vault_comments(self, vault_id: str) -> List[Comment]:
-        cursor = self.db.comments.find({"vault_id": vault_id}).sort("created_at", -1)
-        comments = await cursor.to_list(length=100)
-        return [Comment(**comment) for comment in comments]
+    async def get_vault_comments(self, vault_id: str, limit: int = 20, cursor: Optional[str] = None) -> CursorPage:
+        query: Dict[str, Any] = {"vault_id": vault_id}
+        if cursor:
+            query.update(cursor_filter(cursor))
+        
+        comment_cursor = self.db.comments.find(query, {"_id": 0}) \
+            .sort([("created_at", -1), ("id", -1)]).limit(limit + 1)
+        comments, vault = await asyncio.gather(
+            comment_cursor.to_list(length=limit + 1),
+            self.db.vaults.find_one({"id": vault_id}, {"_id": 0, "comments_count": 1})
+        )
+        
+        page = self._cursor_page(comments, limit, Comment)
+        page.total = vault.get("comments_count", 0) if vault else 0
+        return page
+    
+    async def recount_vault_comments(self) -> int:
+        # Backfill comments_count from the comments collection; returns vaults corrected
+        pipeline = [{"$group": {"_id": "$vault_id", "count": {"$sum": 1}}}]
+        counts = {row["_id"]: row["count"] async for row in self.db.comments.aggregate(pipeline)}
+        
+        corrected = 0
+        async for vault in self.db.vaults.find({}, {"_id": 0, "id": 1, "comments_count": 1}):
+            actual = counts.get(vault["id"], 0)
+            if vault.get("comments_count") != actual:
+                await self.db.vaults.update_one(
+                    {"id": vault["id"]}, {"$set": {"comments_count": actual}, "$inc": {"version": 1}}
+                )
+                corrected += 1
+        await self._bump_counters({LISTING_VERSION_FIELD: corrected})
+        return corrected
+    
+    # Export operations
+    async def iter_documents(self,
+                             collection: str,
+                             fields: List[str],
+                             since: Optional[datetime] = None,
+                             batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        # Streams a whole collection in created_at order, one server batch in memory at a time
+        query = {"created_at": {"$gte": since}} if since else {}
+        projection = {"_id": 0, **{field: 1 for field in fields}}
+        cursor = self.db[collection].find(query, projection) \
+            .sort([("created_at", 1), ("id", 1)]) \
+            .batch_size(batch_size)
+        async for document in cursor:
+            yield document
+    
+    # Facet operations
+    async def get_vault_facets(self,
+                               status: Optional[VaultStatus] = None,
+                               category: Optional[Category] = None,
+                               featured: Optional[bool] = None,
+                               tags_limit: int = 20) -> Dict[str, Any]:
+        key = filter_key(status, category, featured)
+        counts = self.facet_cache.get(key)
+        if counts is None:
+            rows = await self.db.vaults.aggregate(facet_pipeline(self._vault_query(status, category, featured))).to_list(1)
+            counts = counts_from_facets(rows[0] if rows else {})
+            self.facet_cache.set(key, counts)
+        
+        top_tags = sorted(counts["tags"].items(), key=lambda item: (-item[1], item[0]))[:tags_limit]
+        return {
+            **{field: dict(counts[field]) for field in ("category", "status", "secret_type")},
+            "tags": [{"tag": tag, "count": count} for tag, count in top_tags]
+        }
+    
+    # Audio operations
+    async def store_vault_audio(self,
+                                vault_id: str,
+                                filename: str,
+                                content_type: str,
+                                chunks: AsyncIterator[bytes]) -> str:
+        # Writes the recording chunk by chunk into GridFS, then points the vault at it
+        grid_in = self.audio_bucket.open_upload_stream(
+            filename,
+            chunk_size_bytes=AUDIO_CHUNK_SIZE,
+            metadata={"vault_id": vault_id, "content_type": content_type}
+        )
+        try:
+            async for chunk in chunks:
+                await grid_in.write(chunk)
+        except Exception:
+            await grid_in.abort()
+            raise
+        await grid_in.close()
+        
+        file_id = str(grid_in._id)
+        before = await self.db.vaults.find_one_and_update(
+            {"id": vault_id},
+            {"$set": {"audio_file_id": file_id}},
+            projection={"_id": 0, "audio_file_id": 1}
+        )
+        if before is None:
+            await self.audio_bucket.delete(grid_in._id)
+            raise ValueError("Vault not found")
+        if before.get("audio_file_id"):
+            await self.delete_audio(before["audio_file_id"])
+        return file_id
+    
+    async def open_audio(self, file_id: str):
+        try:
+            return await self.audio_bucket.open_download_stream(ObjectId(file_id))
+        except NoFile:
+            return None
+    
+    async def delete_audio(self, file_id: str):
+        try:
+            await self.audio_bucket.delete(ObjectId(file_id))
+        except NoFile:
+            pass
+    
+    # Search operations
+    async def rebuild_search_index(self):
+        await self.search_index.rebuild(self.iter_documents("vaults", SEARCH_FIELDS))
+    
+    async def search_vaults(self,
+                            query: str,
+                            status: Optional[VaultStatus] = None,
+                            category: Optional[Category] = None,
+                            page: int = 1,
+                            per_page: int = 20) -> PaginatedResponse:
+        vault_ids, total = self.search_index.search(query, status, category, per_page, (page - 1) * per_page)
+        
+        # The index ranks; Mongo supplies fresh cards and re-checks the filters
+        cards = []
+        if vault_ids:
+            found = await self._get_vault_cards(
+                {**self._vault_query(status, category), "id": {"$in": vault_ids}}, len(vault_ids)
+            )
+            by_id = {card["id"]: card for card in found}
+            cards = [by_id[vault_id] for vault_id in vault_ids if vault_id in by_id]
+        
+        return PaginatedResponse(
+            items=cards,
+            total=total,
+            page=page,
+            per_page=per_page,
+            has_next=page * per_page < total,
+            has_prev=page > 1
+        )
+    
+    async def _reindex_vault(self, vault_id: str, update_data: Dict[str, Any]):
+        if any(field in update_data for field in SEARCH_FIELDS):
+            vault = await self.db.vaults.find_one({"id": vault_id}, {"_id": 0, **{field: 1 for field in SEARCH_FIELDS}})
+            if vault:
+                self.search_index.add(vault)
+    
+    async def _reindex_status(self, vault_ids: List[str], status: VaultStatus):
+        # After a guarded update_many, only the vaults now in ``status`` actually moved
+        async for vault in self.db.vaults.find({"id": {"$in": vault_ids}, "status": status}, {"_id": 0, "id": 1}):
+            self.search_index.set_status(vault["id"], status)
     
     # Analytics operations
     async def get_vault_stats(self) -> VaultStats:
-        total_vaults = await self.db.vaults.count_documents({})
-        live_vaults = await self.db.vaults.count_documents({"status": VaultStatus.LIVE})
-        funded_vaults = await self.db.vaults.count_documents({"status": {"$in": [VaultStatus.FUNDED, VaultStatus.UNLOCKED]}})
-        
-        # Calculate totals
+        # One pass over the collection computes every counter at once
         pipeline = [
             {"$group": {
                 "_id": None,
-                "total_pledged": {"$sum": "$pledged_amount"},
-                "total_goal": {"$sum": "$funding_goal"}
+                "total_vaults": {"$sum": 1},
+                "live_vaults": {"$sum": {"$cond": [{"$eq": ["$status", VaultStatus.LIVE]}, 1, 0]}},
+                "funded_vaults": {"$sum": {"$cond": [
+                    {"$in": ["$status", [VaultStatus.FUNDED, VaultStatus.UNLOCKED]]}, 1, 0
+                ]}},
+                "total_pledged": {"$sum": "$pledged_amount"}
             }}
         ]
         result = await self.db.vaults.aggregate(pipeline).to_list(1)
-        total_pledged = result[0]["total_pledged"] if result else 0.0
+        stats = result[0] if result else {"total_vaults": 0, "live_vaults": 0, "funded_vaults": 0, "total_pledged": 0.0}
         
         return VaultStats(
-            total_vaults=total_vaults,
-            live_vaults=live_vaults,
-            funded_vaults=funded_vaults,
-            total_pledged=total_pledged,
-            total_earned=total_pledged * 0.9  # After platform fees
+            total_vaults=stats["total_vaults"],
+            live_vaults=stats["live_vaults"],
+            funded_vaults=stats["funded_vaults"],
+            total_pledged=stats["total_pledged"],
+            total_earned=stats["total_pledged"] * 0.9  # After platform fees
         )
     
     async def get_user_stats(self) -> UserStats:
-        total_users = await self.db.users.count_documents({})
-        total_whisperers = await self.db.users.count_documents({"user_type": {"$in": [UserType.WHISPERER, UserType.BOTH]}})
-        total_listeners = await self.db.users.count_documents({"user_type": {"$in": [UserType.LISTENER, UserType.BOTH]}})
-        verified_users = await self.db.users.count_documents({"is_verified": True})
+        pipeline = [
+            {"$group": {
+                "_id": None,
+                "total_users": {"$sum": 1},
+                "total_whisperers": {"$sum": {"$cond": [
+                    {"$in": ["$user_type", [UserType.WHISPERER, UserType.BOTH]]}, 1, 0
+                ]}},
+                "total_listeners": {"$sum": {"$cond": [
+                    {"$in": ["$user_type", [UserType.LISTENER, UserType.BOTH]]}, 1, 0
+                ]}},
+                "verified_users": {"$sum": {"$cond": [{"$eq": ["$is_verified", True]}, 1, 0]}}
+            }}
+        ]
+        result = await self.db.users.aggregate(pipeline).to_list(1)
+        stats = result[0] if result else {"total_users": 0, "total_whisperers": 0, "total_listeners": 0, "verified_users": 0}
         
         return UserStats(
-            total_users=total_users,
-            total_whisperers=total_whisperers,
-            total_listeners=total_listeners,
-            verified_users=verified_users
+            total_users=stats["total_users"],
+            total_whisperers=stats["total_whisperers"],
+            total_listeners=stats["total_listeners"],
+            verified_users=stats["verified_users"]
+        )
+    
+    async def get_platform_stats(self) -> Tuple[VaultStats, UserStats]:
+        # O(1): a single point read of the incrementally maintained counters
+        counters = await self.db.platform_counters.find_one({"_id": PLATFORM_COUNTERS_ID})
+        if not counters:
+            await self.reconcile_platform_counters(fix=True)
+            counters = await self.db.platform_counters.find_one({"_id": PLATFORM_COUNTERS_ID}) or {}
+        
+        total_pledged = counters.get("total_pledged", 0.0)
+        vault_stats = VaultStats(
+            total_vaults=counters.get("total_vaults", 0),
+            live_vaults=counters.get("live_vaults", 0),
+            funded_vaults=counters.get("funded_vaults", 0),
+            total_pledged=total_pledged,
+            total_earned=total_pledged * 0.9  # After platform fees
         )
+        user_stats = UserStats(**{field: counters.get(field, 0) for field in USER_COUNTER_FIELDS})
+        return vault_stats, user_stats
+    
+    async def reconcile_platform_counters(self, fix: bool = False) -> Dict[str, float]:
+        # Recompute the counters from the source collections and report stored - actual
+        vault_stats, user_stats = await asyncio.gather(self.get_vault_stats(), self.get_user_stats())
+        actual = {
+            **{field: getattr(vault_stats, field) for field in VAULT_COUNTER_FIELDS},
+            **{field: getattr(user_stats, field) for field in USER_COUNTER_FIELDS}
+        }
+        
+        stored = await self.db.platform_counters.find_one({"_id": PLATFORM_COUNTERS_ID}) or {}
+        drift = {field: stored.get(field, 0) - value for field, value in actual.items() if stored.get(field, 0) != value}
+        
+        if fix and (drift or not stored):
+            await self.db.platform_counters.update_one(
+                {"_id": PLATFORM_COUNTERS_ID},
+                {"$set": actual},
+                upsert=True
+            )
+        return drift
+    
+    async def ensure_platform_counters(self):
+        # Seed the counters from the source collections on a fresh or pre-counter database
+        if not await self.db.platform_counters.find_one({"_id": PLATFORM_COUNTERS_ID}, {"_id": 1}):
+            await self.reconcile_platform_counters(fix=True)
+    
+    async def _bump_counters(self, deltas: Dict[str, float]):
+        # No upsert: a partial document would pass for seeded counters. Until
+        # ensure_platform_counters has run, the next seed accounts for the change.
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if deltas:
+            await self.db.platform_counters.update_one(
+                {"_id": PLATFORM_COUNTERS_ID},
+                {"$inc": deltas}
+            )
     
     # Helper methods
     def _calculate_time_left(self, deadline: datetime) -> str:
@@ -301,37 +941,75 @@ class Database:
         else:
             return "Less than 1 hour"
     
-    async def _convert_to_vault_responses(self, vaults: List[Vault]) -> List[VaultResponse]:
-        responses = []
-        for vault in vaults:
-            whisperer = await self.get_user_by_id(vault.whisperer_id)
-            progress_percentage = (vault.pledged_amount / vault.funding_goal) * 100
-            time_left = self._calculate_time_left(vault.deadline)
-            
-            response = VaultResponse(
-                id=vault.id,
-                title=vault.title,
-                description=vault.description,
-                category=vault.category,
-                secret_type=vault.secret_type,
-                preview=vault.preview,
-                cover_image_url=vault.cover_image_url,
-                whisperer_id=vault.whisperer_id,
-                whisperer_username=whisperer.username if whisperer else "Unknown",
-                funding_goal=vault.funding_goal,
-                pledged_amount=vault.pledged_amount,
-                backers_count=vault.backers_count,
-                duration_days=vault.duration_days,
-                status=vault.status,
-                is_featured=vault.is_featured,
-                created_at=vault.created_at,
-                deadline=vault.deadline,
-                unlocked_at=vault.unlocked_at,
-                content_warnings=vault.content_warnings,
-                tags=vault.tags,
-                progress_percentage=round(progress_percentage, 1),
-                time_left=time_left
-            )
-            responses.append(response)
+    async def get_user_profiles(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        # Serve public profile fragments from the process cache, batching the misses into one query
+        profiles = {}
+        missing = []
+        for user_id in set(user_ids):
+            profile = self.profile_cache.get(user_id)
+            if profile is None:
+                missing.append(user_id)
+            else:
+                profiles[user_id] = profile
+        
+        if missing:
+            cursor = self.db.users.find({"id": {"$in": missing}}, PROFILE_PROJECTION)
+            for user in await cursor.to_list(length=len(missing)):
+                profile = {
+                    "username": user["username"],
+                    "is_verified": user.get("is_verified", False),
+                    "credibility_score": user.get("credibility_score", 0)
+                }
+                self.profile_cache.set(user["id"], profile)
+                profiles[user["id"]] = profile
         
-        return responses
\ No newline at end of file
+        return profiles
+    
+    async def get_usernames(self, user_ids: List[str]) -> Dict[str, str]:
+        profiles = await self.get_user_profiles(user_ids)
+        return {user_id: profile["username"] for user_id, profile in profiles.items()}
+    
+    def _vault_query(self,
+                     status: Optional[VaultStatus] = None,
+                     category: Optional[Category] = None,
+                     featured: Optional[bool] = None,
+                     cursor: Optional[str] = None) -> Dict[str, Any]:
+        query: Dict[str, Any] = {}
+        if status:
+            query["status"] = status
+        if category:
+            query["category"] = category
+        if featured is not None:
+            query["is_featured"] = featured
+        if cursor:
+            query.update(cursor_filter(cursor))
+        return query
+    
+    async def _get_vault_cards(self, query: Dict[str, Any], limit: int, skip: int = 0) -> List[Dict[str, Any]]:
+        # One aggregation returns ready-to-serialize cards; Python only fills in usernames
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": query},
+            {"$sort": {"created_at": -1, "id": -1}}
+        ]
+        if skip:
+            pipeline.append({"$skip": skip})
+        pipeline += [{"$limit": limit}, VAULT_CARD_STAGE]
+        cards = await self.db.vaults.aggregate(pipeline).to_list(length=limit)
+        
+        # Usernames come from the process-wide profile cache rather than a $lookup
+        usernames = await self.get_usernames([card["whisperer_id"] for card in cards])
+        for card in cards:
+            card["whisperer_username"] = usernames.get(card["whisperer_id"], "Unknown")
+        return cards
+    
+    def _cursor_page(self,
+                     documents: List[Dict[str, Any]],
+                     limit: int,
+                     model: Optional[Callable[..., Any]] = None) -> CursorPage:
+        # ``documents`` was fetched with limit + 1 so we know whether another page exists
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = encode_cursor(documents[-1]["created_at"], documents[-1]["id"])
+        items = [model(**document) for document in documents] if model else documents
+        return CursorPage(items=items, next_cursor=next_cursor)
@@ -0,0 +1,60 @@
+from backend.models import *
+from pydantic_core import to_json
+from typing import Any, AsyncIterator, Dict, List
+import csv
+import io
+import os
+
+# Rows are buffered into chunks of this size before being written to the socket
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Exportable collections and their columns. Vault exports never carry the secret content.
+EXPORT_COLUMNS: Dict[str, List[str]] = {
+    "vaults": list(VaultSummary.model_fields),
+    "pledges": list(Pledge.model_fields),
+    "comments": list(Comment.model_fields),
+}
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    return value
+
+
+async def iter_ndjson(documents: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    chunk = []
+    async for document in documents:
+        chunk.append(to_json(document))
+        if len(chunk) >= EXPORT_BATCH_SIZE:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+async def iter_csv(documents: AsyncIterator[Dict[str, Any]], columns: List[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    rows = 0
+    async for document in documents:
+        writer.writerow([csv_value(document.get(column)) for column in columns])
+        rows += 1
+        if rows >= EXPORT_BATCH_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode()
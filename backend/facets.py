@@ -0,0 +1,89 @@
+from backend.cache import TTLCache
+from backend.search import enum_value
+from typing import Any, Dict, List, Optional, Tuple
+import os
+
+FACET_CACHE_SIZE = int(os.getenv("FACET_CACHE_SIZE", "256"))
+FACET_CACHE_TTL_SECONDS = int(os.getenv("FACET_CACHE_TTL_SECONDS", "300"))
+
+# Vault fields that either are a facet or can be filtered on
+FACET_FIELDS = ["status", "category", "secret_type", "tags", "is_featured"]
+SCALAR_FACETS = ["category", "status", "secret_type"]
+
+FacetCounts = Dict[str, Dict[str, int]]
+FilterKey = Tuple[Optional[str], Optional[str], Optional[bool]]
+
+
+def filter_key(status: Any = None, category: Any = None, featured: Optional[bool] = None) -> FilterKey:
+    return enum_value(status), enum_value(category), featured
+
+
+def facet_pipeline(query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Every facet in one pass over the matching vaults
+    facets = {
+        field: [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}]
+        for field in SCALAR_FACETS
+    }
+    facets["tags"] = [{"$unwind": "$tags"}, {"$group": {"_id": "$tags", "count": {"$sum": 1}}}]
+    return [
+        {"$match": query},
+        {"$project": {"_id": 0, **{field: 1 for field in SCALAR_FACETS + ["tags"]}}},
+        {"$facet": facets}
+    ]
+
+
+def counts_from_facets(row: Dict[str, List[Dict[str, Any]]]) -> FacetCounts:
+    return {field: {bucket["_id"]: bucket["count"] for bucket in row.get(field, [])} for field in SCALAR_FACETS + ["tags"]}
+
+
+class FacetCache:
+    """Facet counts per get_vaults filter combination.
+
+    Entries are computed by one $facet aggregation and then kept current in
+    place: ``apply`` moves a vault's contribution between buckets on
+    create and on status, category, type, tag or featured changes. Batch
+    transitions call ``clear`` instead. Writes from other workers are
+    picked up when entries expire.
+    """
+
+    def __init__(self, maxsize: int = FACET_CACHE_SIZE, ttl: float = FACET_CACHE_TTL_SECONDS):
+        self.cache = TTLCache(maxsize, ttl)
+
+    def get(self, key: FilterKey) -> Optional[FacetCounts]:
+        return self.cache.get(key)
+
+    def set(self, key: FilterKey, counts: FacetCounts):
+        self.cache.set(key, counts)
+
+    def clear(self):
+        self.cache.clear()
+
+    def apply(self, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+        """Adjust every cached entry for a vault changing from ``before`` to ``after``."""
+        for key, counts in self.cache.items():
+            if before is not None and self._matches(before, key):
+                self._add(counts, before, -1)
+            if after is not None and self._matches(after, key):
+                self._add(counts, after, 1)
+
+    @staticmethod
+    def _matches(vault: Dict[str, Any], key: FilterKey) -> bool:
+        status, category, featured = key
+        return (
+            (status is None or enum_value(vault.get("status")) == status)
+            and (category is None or enum_value(vault.get("category")) == category)
+            and (featured is None or bool(vault.get("is_featured")) == featured)
+        )
+
+    @staticmethod
+    def _add(counts: FacetCounts, vault: Dict[str, Any], delta: int):
+        buckets = [(field, enum_value(vault.get(field))) for field in SCALAR_FACETS]
+        buckets += [("tags", tag) for tag in vault.get("tags") or []]
+        for field, value in buckets:
+            field_counts = counts[field]
+            field_counts[value] = field_counts.get(value, 0) + delta
+            if field_counts[value] <= 0:
+                del field_counts[value]
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
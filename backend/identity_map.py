@@ -0,0 +1,89 @@
+from backend.database import Database
+from backend.models import User
+from typing import Any, Dict, List, Optional
+import asyncio
+
+
+class IdentityMapStats:
+    """Process-wide totals across every request-scoped identity map."""
+
+    def __init__(self):
+        self.requests = 0
+        self.user_queries = 0
+        self.hits = 0
+
+    def record(self, identity_map: "IdentityMap"):
+        self.requests += 1
+        self.user_queries += identity_map.user_queries
+        self.hits += identity_map.hits
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "user_queries": self.user_queries,
+            "hits": self.hits,
+            "user_queries_per_request": round(self.user_queries / self.requests, 3) if self.requests else 0.0
+        }
+
+
+class IdentityMap:
+    """Request-scoped cache of user documents.
+
+    Each user is loaded at most once per request, and lookups issued
+    concurrently (e.g. under asyncio.gather) are coalesced into a single
+    ``$in`` query through ``Database.get_users_by_ids``. ``hits`` counts
+    lookups served without a query. A request's total Mongo traffic is
+    counted separately, by ``backend.command_stats``.
+    """
+
+    def __init__(self, database: Database):
+        self.database = database
+        self.user_queries = 0
+        self.hits = 0
+        self._loaded: Dict[str, asyncio.Future] = {}
+        self._pending: List[str] = []
+        self._flushes = set()
+
+    async def get_user(self, user_id: str) -> Optional[User]:
+        return await self._load(user_id)
+
+    def _load(self, user_id: str) -> asyncio.Future:
+        future = self._loaded.get(user_id)
+        if future is not None:
+            self.hits += 1
+            return future
+
+        future = asyncio.get_running_loop().create_future()
+        self._loaded[user_id] = future
+
+        # The first lookup of a batch schedules the flush; lookups made
+        # before it runs join the same query
+        self._pending.append(user_id)
+        if len(self._pending) == 1:
+            flush = asyncio.ensure_future(self._flush())
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+        return future
+
+    async def _flush(self):
+        ids, self._pending = self._pending, []
+        futures = [self._loaded[user_id] for user_id in ids]
+
+        try:
+            users = await self._fetch(ids)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            # Let a later lookup retry instead of caching the failure
+            for user_id in ids:
+                self._loaded.pop(user_id, None)
+            return
+
+        for user_id, future in zip(ids, futures):
+            if not future.done():
+                future.set_result(users.get(user_id))
+
+    async def _fetch(self, ids: List[str]) -> Dict[str, User]:
+        self.user_queries += 1
+        return await self.database.get_users_by_ids(ids)
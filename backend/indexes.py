@@ -0,0 +1,70 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from typing import Dict, List
+
+# Index manifest: every query path in backend/database.py should be covered here
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "vaults": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="vault_feed"),
+        IndexModel(
+            [
+                ("status", ASCENDING),
+                ("category", ASCENDING),
+                ("is_featured", ASCENDING),
+                ("created_at", DESCENDING),
+                ("id", DESCENDING),
+            ],
+            name="vault_filters"
+        ),
+        IndexModel(
+            [("whisperer_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="whisperer_vaults"
+        ),
+        IndexModel([("status", ASCENDING), ("deadline", ASCENDING)], name="vault_deadlines"),
+    ],
+    "pledges": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="user_pledges"
+        ),
+        IndexModel([("user_id", ASCENDING), ("vault_id", ASCENDING)], name="user_vault_pledges"),
+        IndexModel([("vault_id", ASCENDING)], name="vault_pledges"),
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)], name="export_order"),
+    ],
+    "comments": [
+        IndexModel(
+            [("vault_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="vault_comments"
+        ),
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)], name="export_order"),
+    ],
+}
+
+
+async def apply_indexes(db) -> Dict[str, List[str]]:
+    """Create every index in the manifest. Safe to run repeatedly."""
+    created = {}
+    for collection, indexes in INDEXES.items():
+        created[collection] = await db[collection].create_indexes(indexes)
+    return created
+
+
+async def verify_indexes(db) -> Dict[str, List[str]]:
+    """Return the manifest indexes that are missing or differ, keyed by collection."""
+    problems = {}
+    for collection, indexes in INDEXES.items():
+        existing = await db[collection].index_information()
+        for index in indexes:
+            spec = index.document
+            current = existing.get(spec["name"])
+            if current is None:
+                problems.setdefault(collection, []).append(f"{spec['name']}: missing")
+            elif list(current["key"]) != list(spec["key"].items()) \
+                    or current.get("unique", False) != spec.get("unique", False):
+                problems.setdefault(collection, []).append(f"{spec['name']}: definition differs")
+    return problems
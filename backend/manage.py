@@ -0,0 +1,79 @@
+"""Operational commands for the HushHush backend.
+
+    python -m backend.manage indexes apply
+    python -m backend.manage indexes verify
+    python -m backend.manage counters reconcile [--fix]
+    python -m backend.manage comments recount
+"""
+from backend.database import Database
+from backend.indexes import apply_indexes, verify_indexes
+import argparse
+import asyncio
+import os
+
+
+async def indexes_command(db: Database, action: str) -> int:
+    if action == "apply":
+        created = await apply_indexes(db.db)
+        for collection, names in created.items():
+            print(f"✅ {collection}: {', '.join(names)}")
+        return 0
+
+    problems = await verify_indexes(db.db)
+    if not problems:
+        print("✅ All indexes present")
+        return 0
+    for collection, issues in problems.items():
+        for issue in issues:
+            print(f"❌ {collection}.{issue}")
+    return 1
+
+
+async def counters_command(db: Database, fix: bool) -> int:
+    drift = await db.reconcile_platform_counters(fix=fix)
+    if not drift:
+        print("✅ Platform counters match the source collections")
+        return 0
+    for field, delta in drift.items():
+        print(f"{'🔧' if fix else '❌'} {field}: stored value off by {delta:+}")
+    return 0 if fix else 1
+
+
+async def comments_command(db: Database) -> int:
+    corrected = await db.recount_vault_comments()
+    print(f"✅ Recounted comments; corrected {corrected} vaults")
+    return 0
+
+
+async def main(args) -> int:
+    mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+    db_name = os.environ.get('DB_NAME', 'test_database')
+
+    db = Database(mongo_url, db_name)
+    try:
+        if args.command == "indexes":
+            return await indexes_command(db, args.action)
+        if args.command == "counters":
+            return await counters_command(db, args.fix)
+        if args.command == "comments":
+            return await comments_command(db)
+        return 2
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HushHush backend management")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    indexes_parser = subparsers.add_parser("indexes", help="apply or verify the index manifest")
+    indexes_parser.add_argument("action", choices=["apply", "verify"])
+
+    counters_parser = subparsers.add_parser("counters", help="reconcile the platform counters document")
+    counters_parser.add_argument("action", choices=["reconcile"])
+    counters_parser.add_argument("--fix", action="store_true", help="overwrite drifted counters with recomputed values")
+
+    comments_parser = subparsers.add_parser("comments", help="backfill per-vault comment counts")
+    comments_parser.add_argument("action", choices=["recount"])
+
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
@@ -39,6 +39,7 @@ class User(BaseModel):
     user_type: UserType
     is_verified: bool = False
     is_active: bool = True
+    is_admin: bool = False
     avatar_url: Optional[str] = None
     bio: Optional[str] = None
     credibility_score: int = 0
@@ -76,19 +77,20 @@ class UserResponse(BaseModel):
     created_at: datetime
 
 # Vault Models
-class Vault(BaseModel):
+class VaultSummary(BaseModel):
+    # Everything about a vault except the secret content
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str
     description: str
     category: Category
     secret_type: SecretType
-    content: str  # The actual secret content
     preview: str  # Teaser/preview content
     cover_image_url: Optional[str] = None
     whisperer_id: str
     funding_goal: float
     pledged_amount: float = 0.0
     backers_count: int = 0
+    comments_count: int = 0
     duration_days: int
     status: VaultStatus = VaultStatus.DRAFT
     is_featured: bool = False
@@ -97,9 +99,15 @@ class Vault(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     deadline: datetime
     unlocked_at: Optional[datetime] = None
+    settled_at: Optional[datetime] = None  # Set once the vault's pledges are captured or refunded
+    version: int = 0  # Bumped on every change to what the vault's card shows
+    audio_file_id: Optional[str] = None  # GridFS id of the recording for audio secrets
     content_warnings: List[str] = []
     tags: List[str] = []
 
+class Vault(VaultSummary):
+    content: str  # The actual secret content
+
 class VaultCreate(BaseModel):
     title: str
     description: str
@@ -125,6 +133,7 @@ class VaultResponse(BaseModel):
     funding_goal: float
     pledged_amount: float
     backers_count: int
+    comments_count: int = 0
     duration_days: int
     status: VaultStatus
     is_featured: bool
@@ -155,6 +164,17 @@ class PledgeCreate(BaseModel):
     amount: float
     referrer_id: Optional[str] = None
 
+class BulkPledgeItem(PledgeCreate):
+    user_id: str
+
+class BulkPledgeRequest(BaseModel):
+    pledges: List[BulkPledgeItem]
+
+class BulkPledgeResult(BaseModel):
+    index: int
+    pledge_id: Optional[str] = None
+    error: Optional[str] = None
+
 class PledgeResponse(BaseModel):
     id: str
     vault_id: str
@@ -203,4 +223,9 @@ class PaginatedResponse(BaseModel):
     page: int
     per_page: int
     has_next: bool
-    has_prev: bool
\ No newline at end of file
+    has_prev: bool
+
+class CursorPage(BaseModel):
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None  # Only set when known without a count query
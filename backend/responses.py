@@ -0,0 +1,39 @@
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+from typing import Any, Dict, Optional
+import hashlib
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for pre-validated payloads.
+
+    Returning a Response directly skips FastAPI's response_model
+    validation and jsonable_encoder pass. pydantic-core serializes models,
+    datetimes and enums straight to bytes in a single native pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def api_response(message: str, data: Any = None, headers: Optional[Dict[str, str]] = None) -> FastJSONResponse:
+    # Same envelope as APIResponse, without re-validating ``data``
+    return FastJSONResponse({"success": True, "message": message, "data": data}, headers=headers)
+
+
+def make_etag(*parts: Any) -> str:
+    return '"' + hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:20] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(status_code=304, headers={**(headers or {}), "ETag": etag})
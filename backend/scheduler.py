@@ -0,0 +1,103 @@
+from backend.database import Database
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+EXPIRY_INTERVAL_SECONDS = float(os.getenv("EXPIRY_INTERVAL_SECONDS", "60"))
+EXPIRY_BATCH_SIZE = int(os.getenv("EXPIRY_BATCH_SIZE", "500"))
+
+
+class ExpirySweeper:
+    """Expires LIVE vaults past their deadline and settles their pledges.
+
+    Run ``tick`` from a PeriodicTask. Every transition is a guarded
+    update_many, so several API workers can sweep at once without
+    double-counting. ``on_change`` is called after any tick that modified
+    vaults or pledges.
+    """
+
+    def __init__(self,
+                 database: Database,
+                 batch_size: int = EXPIRY_BATCH_SIZE,
+                 on_change: Optional[Callable[[], None]] = None):
+        self.database = database
+        self.batch_size = batch_size
+        self.on_change = on_change
+        self.totals = {"expired": 0, "vaults_settled": 0, "captured": 0, "refunded": 0}
+
+    async def tick(self) -> Dict[str, int]:
+        now = datetime.utcnow()
+        expired = await self.database.expire_vaults(now, self.batch_size)
+        settled = await self.database.settle_vaults(now, self.batch_size)
+        transitions = {
+            "expired": expired,
+            "vaults_settled": settled["vaults"],
+            "captured": settled["captured"],
+            "refunded": settled["refunded"]
+        }
+
+        for key, count in transitions.items():
+            self.totals[key] += count
+        if any(transitions.values()):
+            logger.info(f"Expiry tick: {transitions}")
+            if self.on_change:
+                self.on_change()
+        return transitions
+
+    def stats(self) -> Dict[str, Any]:
+        return {"batch_size": self.batch_size, "totals": self.totals}
+
+
+class PeriodicTask:
+    """Runs ``func`` now and then every ``interval`` seconds until stopped.
+
+    A dict returned by ``func`` is included in ``last_run``.
+    """
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[Any]], interval: float):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.runs = 0
+        self.errors = 0
+        self.last_run: Dict[str, Any] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            try:
+                result = await self.func()
+                self.runs += 1
+                self.last_run = {
+                    **(result if isinstance(result, dict) else {}),
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                    "finished_at": datetime.utcnow()
+                }
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Periodic task {self.name} failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"interval": self.interval, "runs": self.runs, "errors": self.errors, "last_run": self.last_run}
@@ -0,0 +1,250 @@
+from bisect import bisect_left, insort
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import math
+import numpy as np
+import re
+
+# Per-field term weights: a match in the title outranks one in the description
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "preview": 1.0, "description": 1.0}
+
+# Typeahead: how many vocabulary terms a trailing prefix may expand to
+MAX_PREFIX_EXPANSIONS = 50
+
+# Terms present in more than 1/N of the documents are intersected densely
+DENSE_POSTINGS_RATIO = 16
+
+STOPWORDS = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+             "it", "of", "on", "or", "that", "the", "this", "to", "was", "with"}
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def enum_value(value: Any) -> Optional[str]:
+    return getattr(value, "value", value)
+
+
+def document_terms(vault: Dict[str, Any]) -> Dict[str, float]:
+    terms: Dict[str, float] = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        value = vault.get(field) or ""
+        text = " ".join(value) if isinstance(value, list) else value
+        for token in tokenize(text):
+            terms[token] = terms.get(token, 0.0) + weight
+    return terms
+
+
+class SearchIndex:
+    """In-process inverted index over vault title, description, preview and tags.
+
+    ``rebuild`` produces a base segment of sorted numpy posting arrays, so a
+    query is a vectorized intersection starting from its rarest term. Vaults
+    added or changed afterwards go into a small dict-based delta segment
+    and their base entry is tombstoned. Queries AND their terms, treat the
+    last term as a prefix, and rank by summed field weight * idf. Status
+    and category are kept per document so filters never touch Mongo.
+    Writes made while ``rebuild`` awaits its source are replayed into the
+    new index before the swap. Not thread-safe; it is meant to be used
+    from the event loop only.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._ids: List[str] = []
+        self._doc_numbers: Dict[str, int] = {}
+        self._codes: Dict[Optional[str], int] = {None: 0}
+        self._status = np.zeros(capacity, dtype=np.int16)
+        self._category = np.zeros(capacity, dtype=np.int16)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._base: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._delta: Dict[str, Dict[int, float]] = {}
+        self._delta_terms: Dict[int, Tuple[str, ...]] = {}
+        self._vocabulary: List[str] = []
+        self._pending: Optional[List[Tuple[str, tuple]]] = None  # Writes made during a rebuild
+
+    def __len__(self) -> int:
+        return len(self._doc_numbers)
+
+    def add(self, vault: Dict[str, Any]):
+        """Index a vault into the delta segment, replacing any previous version of it."""
+        self._record("add", vault)
+        self._unindex(vault["id"])
+        number = self._new_document(vault)
+        terms = document_terms(vault)
+        self._delta_terms[number] = tuple(terms)
+        for term, weight in terms.items():
+            postings = self._delta.get(term)
+            if postings is None:
+                postings = self._delta[term] = {}
+                if term not in self._base:
+                    insort(self._vocabulary, term)
+            postings[number] = weight
+
+    def remove(self, vault_id: str):
+        self._record("remove", vault_id)
+        self._unindex(vault_id)
+
+    def _unindex(self, vault_id: str):
+        number = self._doc_numbers.pop(vault_id, None)
+        if number is None:
+            return
+        self._alive[number] = False
+        for term in self._delta_terms.pop(number, ()):
+            self._delta[term].pop(number, None)
+
+    def set_status(self, vault_id: str, status: Any):
+        """Update a vault's status filter in place; its terms are unchanged."""
+        self._record("set_status", vault_id, status)
+        number = self._doc_numbers.get(vault_id)
+        if number is not None:
+            self._status[number] = self._code(enum_value(status))
+
+    async def rebuild(self, vaults: AsyncIterator[Dict[str, Any]]):
+        # Build into a fresh index and swap, so searches keep working meanwhile
+        fresh = SearchIndex()
+        postings: Dict[str, Dict[int, float]] = {}
+        self._pending = []
+        try:
+            async for vault in vaults:
+                fresh._unindex(vault["id"])
+                number = fresh._new_document(vault)
+                for term, weight in document_terms(vault).items():
+                    postings.setdefault(term, {})[number] = weight
+
+            for i, (term, docs) in enumerate(postings.items()):
+                fresh._base[term] = (
+                    np.fromiter(docs.keys(), dtype=np.int32, count=len(docs)),
+                    np.fromiter(docs.values(), dtype=np.float32, count=len(docs))
+                )
+                if i % 10000 == 0:
+                    await asyncio.sleep(0)  # Don't hold the event loop for the whole conversion
+            fresh._vocabulary = sorted(postings)
+
+            # The source may have been read before these writes landed
+            for method, args in self._pending:
+                getattr(fresh, method)(*args)
+        finally:
+            self._pending = None
+        self.__dict__.update(fresh.__dict__)
+
+    def search(self,
+               query: str,
+               status: Optional[str] = None,
+               category: Optional[str] = None,
+               limit: int = 20,
+               offset: int = 0) -> Tuple[List[str], int]:
+        """Return ``(vault_ids, total_matches)`` for one page, best first."""
+        tokens = tokenize(query)
+        if not tokens:
+            return [], 0
+
+        # Every term but the last must match exactly; the last may be a prefix
+        term_postings = []
+        for position, token in enumerate(tokens):
+            docs, weights = self._term_postings([token] if position < len(tokens) - 1 else self._prefix_terms(token))
+            if not len(docs):
+                return [], 0
+            idf = math.log(1 + len(self) / len(docs))
+            term_postings.append((docs, weights * np.float32(idf)))
+
+        # Intersect the sorted posting lists, smallest first. Misses score zero
+        # and are dropped by a single compaction at the end.
+        term_postings.sort(key=lambda postings: len(postings[0]))
+        candidates, scores = term_postings[0]
+        keep = self._alive[candidates]
+        for docs, weights in term_postings[1:]:
+            if len(docs) > len(self._ids) // DENSE_POSTINGS_RATIO:
+                # Very common term: a dense scatter/gather beats binary searching it
+                dense = np.zeros(len(self._ids), dtype=np.float32)
+                dense[docs] = weights
+                matched = dense[candidates]
+            else:
+                positions = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+                matched = np.where(docs[positions] == candidates, weights[positions], np.float32(0))
+            scores = scores + matched
+            keep &= matched > 0
+
+        if status:
+            keep &= self._status[candidates] == self._codes.get(enum_value(status), -1)
+        if category:
+            keep &= self._category[candidates] == self._codes.get(enum_value(category), -1)
+        selected = np.flatnonzero(keep)
+        candidates, scores = candidates[selected], scores[selected]
+
+        total = len(candidates)
+        wanted = offset + limit
+        if total > wanted:
+            top = np.argpartition(-scores, wanted - 1)[:wanted]
+            candidates, scores = candidates[top], scores[top]
+        ranked = candidates[np.argsort(-scores, kind="stable")][offset:]
+        return [self._ids[number] for number in ranked], total
+
+    def _term_postings(self, terms: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        # Base and delta postings of one or more terms as (sorted docs, weights)
+        doc_parts, weight_parts = [], []
+        for term in terms:
+            docs, weights = self._base.get(term, (None, None))
+            if docs is not None:
+                doc_parts.append(docs)
+                weight_parts.append(weights)
+            delta = self._delta.get(term)
+            if delta:
+                # Delta documents are numbered after every base document, in insertion order
+                doc_parts.append(np.fromiter(delta.keys(), dtype=np.int32, count=len(delta)))
+                weight_parts.append(np.fromiter(delta.values(), dtype=np.float32, count=len(delta)))
+        if not doc_parts:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+        docs, weights = np.concatenate(doc_parts), np.concatenate(weight_parts)
+        if len(terms) > 1:
+            # A document matching several prefix expansions keeps its best one
+            order = np.lexsort((-weights, docs))
+            docs, weights = docs[order], weights[order]
+            first = np.ones(len(docs), dtype=bool)
+            first[1:] = docs[1:] != docs[:-1]
+            docs, weights = docs[first], weights[first]
+        return docs, weights
+
+    def _record(self, method: str, *args):
+        if self._pending is not None:
+            self._pending.append((method, args))
+
+    def _new_document(self, vault: Dict[str, Any]) -> int:
+        number = len(self._ids)
+        if number == len(self._alive):
+            self._grow()
+        self._ids.append(vault["id"])
+        self._doc_numbers[vault["id"]] = number
+        self._status[number] = self._code(enum_value(vault.get("status")))
+        self._category[number] = self._code(enum_value(vault.get("category")))
+        self._alive[number] = True
+        return number
+
+    def _grow(self):
+        capacity = len(self._alive) * 2
+        self._status = np.resize(self._status, capacity)
+        self._category = np.resize(self._category, capacity)
+        self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), dtype=bool)])
+
+    def _code(self, value: Optional[str]) -> int:
+        return self._codes.setdefault(value, len(self._codes))
+
+    def _prefix_terms(self, prefix: str) -> List[str]:
+        start = bisect_left(self._vocabulary, prefix)
+        terms = []
+        for term in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self),
+            "slots": len(self._ids),
+            "base_terms": len(self._base),
+            "delta_documents": len(self._delta_terms)
+        }
@@ -161,6 +161,10 @@ async def seed_database():
     await db.db.vaults.delete_many({})
     await db.db.pledges.delete_many({})
     await db.db.comments.delete_many({})
+    await db.db.platform_counters.delete_many({})
+    
+    # Start the counters at zero so every write below is counted
+    await db.ensure_platform_counters()
     
     # Create users
     created_users = []
@@ -1,15 +1,27 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Request, status
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from pathlib import Path
+import asyncio
 import os
 import logging
-from typing import List, Optional
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
 
 # Local imports
 from backend.models import *
-from backend.database import Database
-from backend.auth import create_access_token, get_current_user
+from backend.database import Database, decode_cursor
+from backend.cache import ResponseCache
+from backend.responses import api_response, etag_matches, make_etag, not_modified
+from backend.audio import MultipartFileStream, RangeNotSatisfiable, UploadTooLarge, iter_grid_out, parse_range
+from backend.exports import EXPORT_BATCH_SIZE, EXPORT_COLUMNS, EXPORT_MEDIA_TYPES, iter_csv, iter_ndjson
+from backend.identity_map import IdentityMap, IdentityMapStats
+from backend.command_stats import CommandStats, CommandStatsMiddleware
+from backend.scheduler import EXPIRY_INTERVAL_SECONDS, ExpirySweeper, PeriodicTask
+from backend.trending import TRENDING_REFRESH_SECONDS, TrendingRanker
+from backend.auth import create_access_token, get_current_user, password_hasher, token_cache, AuthPoolSaturated
 
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
@@ -33,16 +45,87 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Count Mongo commands per request
+command_stats = CommandStats()
+app.add_middleware(CommandStatsMiddleware, stats=command_stats)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Page size bounds shared by every paginated route
+MAX_PAGE_SIZE = 100
+
+def check_page(limit: int, skip: int = 0):
+    # ``skip`` is whatever offset the route takes: skip, offset or (page - 1)
+    if not 1 <= limit <= MAX_PAGE_SIZE or skip < 0:
+        raise ValueError(f"Page size must be between 1 and {MAX_PAGE_SIZE} and the offset non-negative")
+
+# Request-scoped identity map
+identity_map_stats = IdentityMapStats()
+
+async def get_identity_map():
+    identity_map = IdentityMap(database)
+    try:
+        yield identity_map
+    finally:
+        identity_map_stats.record(identity_map)
+        logger.debug(f"Identity map: {identity_map.user_queries} user queries, {identity_map.hits} hits")
+
+# Response cache for public, hot read routes
+response_cache = ResponseCache()
+response_cache.configure(
+    "vaults",
+    ttl=float(os.getenv("VAULT_FEED_CACHE_TTL_SECONDS", "5")),
+    stale_ttl=float(os.getenv("VAULT_FEED_CACHE_STALE_SECONDS", "30"))
+)
+response_cache.configure(
+    "analytics_stats",
+    ttl=float(os.getenv("STATS_CACHE_TTL_SECONDS", "30")),
+    stale_ttl=float(os.getenv("STATS_CACHE_STALE_SECONDS", "300"))
+)
+
+# Largest batch accepted by POST /pledges/bulk
+BULK_PLEDGE_MAX_ITEMS = int(os.getenv("BULK_PLEDGE_MAX_ITEMS", "10000"))
+
+async def require_admin(
+    current_user_id: str = Depends(get_current_user),
+    identity: IdentityMap = Depends(get_identity_map)
+) -> str:
+    user = await identity.get_user(current_user_id)
+    if not user or not user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user_id
+
+def cache_headers(cache_status: str, age: float) -> Dict[str, str]:
+    return {"X-Cache": cache_status, "Age": str(int(age))}
+
+def invalidate_vault_caches():
+    # Fired after any write that changes what the vault feed or stats show
+    response_cache.invalidate("vaults", "analytics_stats")
+
+# Deadline expiry and pledge settlement
+expiry_sweeper = ExpirySweeper(database, on_change=invalidate_vault_caches)
+expiry_task = PeriodicTask("expiry", expiry_sweeper.tick, EXPIRY_INTERVAL_SECONDS)
+
+# Trending ranking, served from memory
+trending_ranker = TrendingRanker(database)
+trending_refresh = PeriodicTask("trending", trending_ranker.refresh, TRENDING_REFRESH_SECONDS)
+
+# Search index rebuild; create_vault/update_vault keep it current in between
+search_index_refresh = PeriodicTask(
+    "search_index",
+    database.rebuild_search_index,
+    interval=float(os.getenv("SEARCH_INDEX_REFRESH_SECONDS", "600"))
+)
+
 # Authentication endpoints
 @api_router.post("/auth/register", response_model=APIResponse)
 async def register(user_data: UserCreate):
     """Register a new user"""
     try:
         user = await database.create_user(user_data)
+        response_cache.invalidate("analytics_stats")
         
         # Create access token
         access_token = create_access_token(data={"sub": user.id})
@@ -58,6 +141,8 @@ async def register(user_data: UserCreate):
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except AuthPoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"Registration error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -87,15 +172,20 @@ async def login(credentials: UserLogin):
         )
     except HTTPException:
         raise
+    except AuthPoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         logger.error(f"Login error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @api_router.get("/auth/me", response_model=APIResponse)
-async def get_current_user_info(current_user_id: str = Depends(get_current_user)):
+async def get_current_user_info(
+    current_user_id: str = Depends(get_current_user),
+    identity: IdentityMap = Depends(get_identity_map)
+):
     """Get current user information"""
     try:
-        user = await database.get_user_by_id(current_user_id)
+        user = await identity.get_user(current_user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -117,75 +207,147 @@ async def get_vaults(
     category: Optional[str] = None,
     featured: Optional[bool] = None,
     limit: int = 20,
-    skip: int = 0
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
-    """Get list of vaults"""
+    """Get list of vaults.
+
+    Passing ``cursor`` (empty for the first page) switches to keyset
+    pagination and returns ``{"items": [...], "next_cursor": ...}``;
+    otherwise ``skip``/``limit`` pagination returns a plain list.
+    """
     try:
         vault_status = VaultStatus(status) if status else None
         vault_category = Category(category) if category else None
+        check_page(limit, skip)
         
-        vaults = await database.get_vault_responses(
-            status=vault_status,
-            category=vault_category,
-            featured=featured,
-            limit=limit,
-            skip=skip
-        )
+        async def load_vaults():
+            if cursor is not None:
+                return await database.get_vault_page(
+                    status=vault_status,
+                    category=vault_category,
+                    featured=featured,
+                    limit=limit,
+                    cursor=cursor
+                )
+            return await database.get_vault_responses(
+                status=vault_status,
+                category=vault_category,
+                featured=featured,
+                limit=limit,
+                skip=skip
+            )
         
-        return APIResponse(
-            success=True,
-            message="Vaults retrieved successfully",
-            data=vaults
+        if cursor:
+            decode_cursor(cursor)  # Reject malformed cursors before they reach the cache
+        
+        # Any vault change bumps the listing version; time_left is allowed to lag a minute
+        listing_version = await database.get_listing_version()
+        etag = make_etag("vaults", listing_version, int(time.time() // 60))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        
+        # Keying on the version keeps cached pages from outliving their ETag
+        params = {"status": vault_status, "category": vault_category, "featured": featured, "limit": limit, "v": listing_version}
+        if cursor is not None:
+            params["cursor"] = cursor
+        else:
+            params["skip"] = skip
+        vaults, cache_status, age = await response_cache.get_or_compute("vaults", params, load_vaults)
+        
+        return api_response(
+            "Vaults retrieved successfully",
+            vaults,
+            headers={**cache_headers(cache_status, age), "ETag": etag}
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Get vaults error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@api_router.get("/vaults/trending", response_model=APIResponse)
+async def get_trending_vaults(limit: int = 20, offset: int = 0):
+    """Get LIVE vaults ranked by trending score"""
+    try:
+        check_page(limit, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return api_response("Trending vaults retrieved successfully", trending_ranker.page(limit, offset))
+
+@api_router.get("/vaults/search", response_model=APIResponse)
+async def search_vaults(
+    q: str,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    page: int = 1,
+    per_page: int = 20
+):
+    """Search vault titles, descriptions, previews and tags"""
+    try:
+        check_page(per_page, page - 1)
+        
+        results = await database.search_vaults(
+            q,
+            status=VaultStatus(status) if status else None,
+            category=Category(category) if category else None,
+            page=page,
+            per_page=per_page
+        )
+        return api_response("Search completed successfully", results)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Search vaults error: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@api_router.get("/vaults/facets", response_model=APIResponse)
+async def get_vault_facets(
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    featured: Optional[bool] = None,
+    tags_limit: int = 20
+):
+    """Get vault counts by category, status, secret type and top tags"""
+    try:
+        facets = await database.get_vault_facets(
+            status=VaultStatus(status) if status else None,
+            category=Category(category) if category else None,
+            featured=featured,
+            tags_limit=max(tags_limit, 0)
+        )
+        return api_response("Facets retrieved successfully", facets)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Get facets error: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @api_router.get("/vaults/{vault_id}", response_model=APIResponse)
-async def get_vault(vault_id: str):
+async def get_vault(vault_id: str, if_none_match: Optional[str] = Header(None)):
     """Get vault details"""
     try:
-        vault = await database.get_vault_by_id(vault_id)
-        if not vault:
+        # A point read of the version decides 304s before any card is built
+        state = await database.get_vault_version(vault_id)
+        if not state:
             raise HTTPException(status_code=404, detail="Vault not found")
-        
-        # Get whisperer info
-        whisperer = await database.get_user_by_id(vault.whisperer_id)
-        
-        # Calculate progress and time left
-        progress_percentage = (vault.pledged_amount / vault.funding_goal) * 100
-        time_left = database._calculate_time_left(vault.deadline)
-        
-        vault_response = VaultResponse(
-            id=vault.id,
-            title=vault.title,
-            description=vault.description,
-            category=vault.category,
-            secret_type=vault.secret_type,
-            preview=vault.preview,
-            cover_image_url=vault.cover_image_url,
-            whisperer_id=vault.whisperer_id,
-            whisperer_username=whisperer.username if whisperer else "Unknown",
-            funding_goal=vault.funding_goal,
-            pledged_amount=vault.pledged_amount,
-            backers_count=vault.backers_count,
-            duration_days=vault.duration_days,
-            status=vault.status,
-            is_featured=vault.is_featured,
-            created_at=vault.created_at,
-            deadline=vault.deadline,
-            unlocked_at=vault.unlocked_at,
-            content_warnings=vault.content_warnings,
-            tags=vault.tags,
-            progress_percentage=round(progress_percentage, 1),
-            time_left=time_left
+        # The card also shows the whisperer's username, which changes without a version bump
+        usernames = await database.get_usernames([state["whisperer_id"]])
+        etag = make_etag(
+            vault_id,
+            state.get("version", 0),
+            database._calculate_time_left(state["deadline"]),
+            usernames.get(state["whisperer_id"])
         )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
         
-        return APIResponse(
-            success=True,
-            message="Vault retrieved successfully",
-            data=vault_response
-        )
+        vault_response = await database.get_vault_response(vault_id)
+        if not vault_response:
+            raise HTTPException(status_code=404, detail="Vault not found")
+        
+        return api_response("Vault retrieved successfully", vault_response, headers={"ETag": etag})
     except HTTPException:
         raise
     except Exception as e:
@@ -195,16 +357,18 @@ async def get_vault(vault_id: str):
 @api_router.post("/vaults", response_model=APIResponse)
 async def create_vault(
     vault_data: VaultCreate,
-    current_user_id: str = Depends(get_current_user)
+    current_user_id: str = Depends(get_current_user),
+    identity: IdentityMap = Depends(get_identity_map)
 ):
     """Create a new vault"""
     try:
         # Verify user can create vaults
-        user = await database.get_user_by_id(current_user_id)
+        user = await identity.get_user(current_user_id)
         if not user or user.user_type not in [UserType.WHISPERER, UserType.BOTH]:
             raise HTTPException(status_code=403, detail="Only whisperers can create vaults")
         
         vault = await database.create_vault(vault_data, current_user_id)
+        invalidate_vault_caches()
         
         return APIResponse(
             success=True,
@@ -217,6 +381,21 @@ async def create_vault(
         logger.error(f"Create vault error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+async def get_unlocked_vault(vault_id: str, user_id: str) -> Dict:
+    """Vault content fields, if the vault is unlocked and the user pledged to or owns it"""
+    vault = await database.get_vault_content(vault_id)
+    if not vault:
+        raise HTTPException(status_code=404, detail="Vault not found")
+    
+    # Check if vault is unlocked
+    if vault["status"] != VaultStatus.UNLOCKED:
+        raise HTTPException(status_code=403, detail="Vault is not unlocked yet")
+    
+    # Check if user has pledged
+    if vault["whisperer_id"] != user_id and not await database.has_pledged(user_id, vault_id):
+        raise HTTPException(status_code=403, detail="You must pledge to access this content")
+    return vault
+
 @api_router.get("/vaults/{vault_id}/content", response_model=APIResponse)
 async def get_vault_content(
     vault_id: str,
@@ -224,46 +403,115 @@ async def get_vault_content(
 ):
     """Get vault content (only if unlocked and user has pledged)"""
     try:
-        vault = await database.get_vault_by_id(vault_id)
+        vault = await get_unlocked_vault(vault_id, current_user_id)
+        
+        return APIResponse(
+            success=True,
+            message="Vault content retrieved",
+            data={"content": vault["content"]}
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get vault content error: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@api_router.post("/vaults/{vault_id}/audio", response_model=APIResponse)
+async def upload_vault_audio(
+    vault_id: str,
+    request: Request,
+    current_user_id: str = Depends(get_current_user)
+):
+    """Attach the recording to an audio vault (owner only); replaces any previous one.
+
+    Expects multipart/form-data with the recording in a ``file`` field. The
+    body is streamed into GridFS as it arrives and never spooled.
+    """
+    try:
+        vault = await database.get_vault_content(vault_id)
         if not vault:
             raise HTTPException(status_code=404, detail="Vault not found")
+        if vault["whisperer_id"] != current_user_id:
+            raise HTTPException(status_code=403, detail="Only the vault owner can upload audio")
+        if vault.get("secret_type") != SecretType.AUDIO:
+            raise HTTPException(status_code=400, detail="Vault is not an audio secret")
         
-        # Check if vault is unlocked
-        if vault.status != VaultStatus.UNLOCKED:
-            raise HTTPException(status_code=403, detail="Vault is not unlocked yet")
-        
-        # Check if user has pledged
-        user_pledges = await database.get_user_pledges(current_user_id)
-        has_pledged = any(pledge.vault_id == vault_id for pledge in user_pledges)
+        upload = MultipartFileStream(request)
+        await upload.open()
+        if not upload.content_type.startswith("audio/"):
+            raise HTTPException(status_code=400, detail="File must be audio")
         
-        if not has_pledged and vault.whisperer_id != current_user_id:
-            raise HTTPException(status_code=403, detail="You must pledge to access this content")
+        file_id = await database.store_vault_audio(
+            vault_id, upload.filename or vault_id, upload.content_type, upload.chunks()
+        )
         
         return APIResponse(
             success=True,
-            message="Vault content retrieved",
-            data={"content": vault.content}
+            message="Audio uploaded successfully",
+            data={"audio_file_id": file_id}
         )
     except HTTPException:
         raise
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Get vault content error: {e}")
+        logger.error(f"Upload vault audio error: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@api_router.get("/vaults/{vault_id}/audio")
+async def stream_vault_audio(
+    vault_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    current_user_id: str = Depends(get_current_user)
+):
+    """Stream an unlocked vault's recording, honouring single byte-range requests"""
+    try:
+        vault = await get_unlocked_vault(vault_id, current_user_id)
+        grid_out = await database.open_audio(vault["audio_file_id"]) if vault.get("audio_file_id") else None
+        if grid_out is None:
+            raise HTTPException(status_code=404, detail="Vault has no audio")
+        
+        size = grid_out.length
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+        
+        start, end = byte_range or (0, size - 1)
+        headers = {"Accept-Ranges": "bytes", "Content-Length": str(end - start + 1)}
+        if byte_range:
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return StreamingResponse(
+            iter_grid_out(grid_out, start, end - start + 1),
+            status_code=206 if byte_range else 200,
+            media_type=(grid_out.metadata or {}).get("content_type", "application/octet-stream"),
+            headers=headers
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Stream vault audio error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 # Pledge endpoints
 @api_router.post("/pledges", response_model=APIResponse)
 async def create_pledge(
     pledge_data: PledgeCreate,
-    current_user_id: str = Depends(get_current_user)
+    current_user_id: str = Depends(get_current_user),
+    identity: IdentityMap = Depends(get_identity_map)
 ):
     """Create a new pledge"""
     try:
         # Verify user can pledge
-        user = await database.get_user_by_id(current_user_id)
+        user = await identity.get_user(current_user_id)
         if not user or user.user_type not in [UserType.LISTENER, UserType.BOTH]:
             raise HTTPException(status_code=403, detail="Only listeners can create pledges")
         
         pledge = await database.create_pledge(pledge_data, current_user_id)
+        invalidate_vault_caches()
+        trending_ranker.record_pledge(pledge.vault_id, pledge.amount)
         
         return APIResponse(
             success=True,
@@ -278,17 +526,54 @@ async def create_pledge(
         logger.error(f"Create pledge error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@api_router.get("/pledges/my", response_model=APIResponse)
-async def get_my_pledges(current_user_id: str = Depends(get_current_user)):
-    """Get current user's pledges"""
+@api_router.post("/pledges/bulk", response_model=APIResponse)
+async def create_pledges_bulk(
+    batch: BulkPledgeRequest,
+    admin_id: str = Depends(require_admin)
+):
+    """Ingest a batch of pledges on behalf of listeners"""
     try:
-        pledges = await database.get_user_pledges(current_user_id)
+        if not batch.pledges:
+            raise ValueError("Batch is empty")
+        if len(batch.pledges) > BULK_PLEDGE_MAX_ITEMS:
+            raise ValueError(f"Batch exceeds {BULK_PLEDGE_MAX_ITEMS} pledges")
         
-        return APIResponse(
-            success=True,
-            message="Pledges retrieved successfully",
-            data=pledges
+        results = await database.create_pledges_bulk(batch.pledges)
+        created = 0
+        for result in results:
+            if result.pledge_id:
+                item = batch.pledges[result.index]
+                trending_ranker.record_pledge(item.vault_id, item.amount)
+                created += 1
+        if created:
+            invalidate_vault_caches()
+        
+        return api_response(
+            f"Created {created} of {len(results)} pledges",
+            {"created": created, "failed": len(results) - created, "results": results}
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk pledge error: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@api_router.get("/pledges/my", response_model=APIResponse)
+async def get_my_pledges(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    current_user_id: str = Depends(get_current_user)
+):
+    """Get current user's pledges, newest first, paginated by cursor"""
+    try:
+        check_page(limit)
+        pledges = await database.get_user_pledges(current_user_id, limit=limit, cursor=cursor)
+        
+        return api_response("Pledges retrieved successfully", pledges)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Get pledges error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -297,17 +582,25 @@ async def get_my_pledges(current_user_id: str = Depends(get_current_user)):
 @api_router.post("/comments", response_model=APIResponse)
 async def create_comment(
     comment_data: CommentCreate,
-    current_user_id: str = Depends(get_current_user)
+    current_user_id: str = Depends(get_current_user),
+    identity: IdentityMap = Depends(get_identity_map)
 ):
     """Create a comment on a vault"""
     try:
-        comment = await database.create_comment(comment_data, current_user_id)
+        user = await identity.get_user(current_user_id)
+        if not user:
+            raise HTTPException(status_code=400, detail="User not found")
+        
+        comment = await database.create_comment(comment_data, current_user_id, username=user.username)
+        response_cache.invalidate("vaults")
         
         return APIResponse(
             success=True,
             message="Comment created successfully",
             data=comment
         )
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -315,83 +608,79 @@ async def create_comment(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @api_router.get("/comments/{vault_id}", response_model=APIResponse)
-async def get_vault_comments(vault_id: str):
-    """Get comments for a vault"""
+async def get_vault_comments(vault_id: str, limit: int = 20, cursor: Optional[str] = None):
+    """Get comments for a vault, newest first, paginated by cursor"""
     try:
-        comments = await database.get_vault_comments(vault_id)
+        check_page(limit)
+        comments = await database.get_vault_comments(vault_id, limit=limit, cursor=cursor)
         
-        return APIResponse(
-            success=True,
-            message="Comments retrieved successfully",
-            data=comments
-        )
+        return api_response("Comments retrieved successfully", comments)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Get comments error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 # User dashboard endpoints
 @api_router.get("/dashboard/whisperer", response_model=APIResponse)
-async def get_whisperer_dashboard(current_user_id: str = Depends(get_current_user)):
+async def get_whisperer_dashboard(
+    status: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    current_user_id: str = Depends(get_current_user),
+    identity: IdentityMap = Depends(get_identity_map)
+):
     """Get whisperer dashboard data"""
     try:
-        user = await database.get_user_by_id(current_user_id)
+        user = await identity.get_user(current_user_id)
         if not user or user.user_type not in [UserType.WHISPERER, UserType.BOTH]:
             raise HTTPException(status_code=403, detail="Access denied")
         
-        # Get user's vaults
-        user_vaults = await database.get_user_vaults(current_user_id)
-        
-        # Calculate stats
-        total_earned = sum(v.pledged_amount * 0.9 for v in user_vaults if v.status == VaultStatus.UNLOCKED)
-        active_vaults = len([v for v in user_vaults if v.status == VaultStatus.LIVE])
+        vault_status = VaultStatus(status) if status else None
+        check_page(limit)
         
-        return APIResponse(
-            success=True,
-            message="Dashboard data retrieved",
-            data={
-                "vaults": user_vaults,
-                "stats": {
-                    "total_earned": total_earned,
-                    "active_vaults": active_vaults,
-                    "total_vaults": len(user_vaults),
-                    "credibility_score": user.credibility_score
-                }
-            }
+        # Get a page of the user's vaults and the all-time totals
+        user_vaults, stats = await asyncio.gather(
+            database.get_user_vaults(current_user_id, status=vault_status, limit=limit, cursor=cursor),
+            database.get_whisperer_vault_summary(current_user_id)
         )
+        stats["credibility_score"] = user.credibility_score
+        
+        return api_response("Dashboard data retrieved", {
+            "vaults": user_vaults.items,
+            "next_cursor": user_vaults.next_cursor,
+            "stats": stats
+        })
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Get whisperer dashboard error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @api_router.get("/dashboard/listener", response_model=APIResponse)
-async def get_listener_dashboard(current_user_id: str = Depends(get_current_user)):
+async def get_listener_dashboard(
+    current_user_id: str = Depends(get_current_user),
+    identity: IdentityMap = Depends(get_identity_map)
+):
     """Get listener dashboard data"""
     try:
-        user = await database.get_user_by_id(current_user_id)
+        user = await identity.get_user(current_user_id)
         if not user or user.user_type not in [UserType.LISTENER, UserType.BOTH]:
             raise HTTPException(status_code=403, detail="Access denied")
         
-        # Get user's pledges
-        user_pledges = await database.get_user_pledges(current_user_id)
-        
-        # Calculate stats
-        total_pledged = sum(p.amount for p in user_pledges)
-        active_pledges = len([p for p in user_pledges if p.status == "authorized"])
-        
-        return APIResponse(
-            success=True,
-            message="Dashboard data retrieved",
-            data={
-                "pledges": user_pledges,
-                "stats": {
-                    "total_pledged": total_pledged,
-                    "active_pledges": active_pledges,
-                    "total_pledges": len(user_pledges),
-                    "referral_credits": sum(p.referral_credit_earned for p in user_pledges)
-                }
-            }
+        # Get the latest page of pledges and the all-time totals
+        user_pledges, stats = await asyncio.gather(
+            database.get_user_pledges(current_user_id),
+            database.get_user_pledge_summary(current_user_id)
         )
+        
+        return api_response("Dashboard data retrieved", {
+            "pledges": user_pledges.items,
+            "next_cursor": user_pledges.next_cursor,
+            "stats": stats
+        })
     except HTTPException:
         raise
     except Exception as e:
@@ -403,30 +692,81 @@ async def get_listener_dashboard(current_user_id: str = Depends(get_current_user
 async def get_platform_stats():
     """Get platform analytics"""
     try:
-        vault_stats = await database.get_vault_stats()
-        user_stats = await database.get_user_stats()
+        (vault_stats, user_stats), cache_status, age = await response_cache.get_or_compute(
+            "analytics_stats", {}, database.get_platform_stats
+        )
         
-        return APIResponse(
-            success=True,
-            message="Analytics retrieved successfully",
-            data={
-                "vaults": vault_stats,
-                "users": user_stats
-            }
+        return api_response(
+            "Analytics retrieved successfully",
+            {"vaults": vault_stats, "users": user_stats},
+            headers=cache_headers(cache_status, age)
         )
     except Exception as e:
         logger.error(f"Get analytics error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+# Admin endpoints
+@api_router.get("/admin/export/{collection}")
+async def export_collection(
+    collection: str,
+    format: str = "ndjson",
+    since: Optional[datetime] = None,
+    admin_id: str = Depends(require_admin)
+):
+    """Stream a full collection dump as NDJSON or CSV"""
+    if collection not in EXPORT_COLUMNS:
+        raise HTTPException(status_code=404, detail="Unknown export collection")
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be ndjson or csv")
+    
+    columns = EXPORT_COLUMNS[collection]
+    documents = database.iter_documents(collection, columns, since=since, batch_size=EXPORT_BATCH_SIZE)
+    body = iter_csv(documents, columns) if format == "csv" else iter_ndjson(documents)
+    
+    logger.info(f"Export of {collection} as {format} since {since} started by {admin_id}")
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{collection}.{format}"'}
+    )
+
 # Health check
 @api_router.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "HushHush API is running"}
 
+@api_router.get("/metrics")
+async def get_metrics(admin_id: str = Depends(require_admin)):
+    """In-process cache and pool counters (admin only)"""
+    return {
+        "token_cache": token_cache.stats(),
+        "auth_pool": password_hasher.stats(),
+        "mongo_commands": command_stats.stats(),
+        "identity_map": identity_map_stats.stats(),
+        "profile_cache": database.profile_cache.stats(),
+        "facet_cache": database.facet_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "expiry_scheduler": {**expiry_sweeper.stats(), **expiry_task.stats()},
+        "trending": {**trending_ranker.stats(), **trending_refresh.stats()},
+        "search_index": {**database.search_index.stats(), **search_index_refresh.stats()}
+    }
+
 # Include router
 app.include_router(api_router)
 
+@app.on_event("startup")
+async def startup_event():
+    await database.ensure_indexes()
+    await database.ensure_platform_counters()
+    expiry_task.start()
+    trending_refresh.start()
+    search_index_refresh.start()
+
 @app.on_event("shutdown")
 async def shutdown_event():
-    await database.close()
\ No newline at end of file
+    await expiry_task.stop()
+    await trending_refresh.stop()
+    await search_index_refresh.stop()
+    await database.close()
+    password_hasher.shutdown()
\ No newline at end of file
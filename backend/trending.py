@@ -0,0 +1,113 @@
+from backend.database import Database
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+import asyncio
+import math
+import os
+
+TRENDING_REFRESH_SECONDS = float(os.getenv("TRENDING_REFRESH_SECONDS", "60"))
+TRENDING_MAX_VAULTS = int(os.getenv("TRENDING_MAX_VAULTS", "5000"))
+
+# Score weights. Velocity is measured relative to the funding goal so small
+# vaults can trend; the last hour counts on top of the last day.
+HOUR_VELOCITY_WEIGHT = 4.0
+VELOCITY_WEIGHT = 100.0
+BACKERS_WEIGHT = 10.0
+PROGRESS_WEIGHT = 20.0
+URGENCY_WEIGHT = 10.0
+
+
+def trending_score(card: Dict[str, Any], pledged_hour: float, pledged_day: float, now: datetime) -> float:
+    goal = max(card["funding_goal"], 1.0)
+    velocity = (HOUR_VELOCITY_WEIGHT * pledged_hour + pledged_day) / goal
+    progress = min(card["pledged_amount"] / goal, 1.0)
+    hours_left = max((card["deadline"] - now).total_seconds() / 3600, 0.0)
+    urgency = 1.0 / (1.0 + hours_left / 24)
+    return round(
+        VELOCITY_WEIGHT * velocity
+        + BACKERS_WEIGHT * math.log1p(card["backers_count"])
+        + PROGRESS_WEIGHT * progress
+        + URGENCY_WEIGHT * urgency,
+        4
+    )
+
+
+class TrendingRanker:
+    """In-memory trending ranking of LIVE vaults.
+
+    A periodic refresh rebuilds every score from the vault cards and the
+    last day of pledges. Between refreshes ``record_pledge`` rescores the
+    affected vault in place, so serving a page is a slice of a sorted list
+    and never touches Mongo. Each worker only sees its own pledges
+    incrementally; the refresh brings every worker back in line. Run
+    ``refresh`` from a PeriodicTask.
+    """
+
+    def __init__(self, database: Database, max_vaults: int = TRENDING_MAX_VAULTS):
+        self.database = database
+        self.max_vaults = max_vaults
+        self.incremental_updates = 0
+        # (-score, vault_id) ascending, i.e. best first
+        self._ranking: List[Tuple[float, str]] = []
+        self._scores: Dict[str, float] = {}
+        self._cards: Dict[str, Dict[str, Any]] = {}
+        self._windows: Dict[str, List[float]] = {}
+
+    async def refresh(self) -> Dict[str, int]:
+        now = datetime.utcnow()
+
+        cards, totals = await asyncio.gather(
+            self.database.get_live_vault_cards(self.max_vaults),
+            self.database.get_recent_pledge_totals(now - timedelta(hours=1), now - timedelta(days=1))
+        )
+
+        scores, windows, card_map = {}, {}, {}
+        for card in cards:
+            pledged_hour, pledged_day = totals.get(card["id"], (0.0, 0.0))
+            card["trending_score"] = scores[card["id"]] = trending_score(card, pledged_hour, pledged_day, now)
+            windows[card["id"]] = [pledged_hour, pledged_day]
+            card_map[card["id"]] = card
+
+        # Swap in the new state in one step so readers never see a partial ranking
+        self._ranking = sorted((-score, vault_id) for vault_id, score in scores.items())
+        self._scores, self._windows, self._cards = scores, windows, card_map
+        return {"vaults": len(cards)}
+
+    def record_pledge(self, vault_id: str, amount: float):
+        card = self._cards.get(vault_id)
+        if card is None:
+            return
+
+        card["pledged_amount"] += amount
+        card["backers_count"] += 1
+        card["progress_percentage"] = round(card["pledged_amount"] / card["funding_goal"] * 100, 1) \
+            if card["funding_goal"] > 0 else 0.0
+        self._remove(vault_id)
+        self.incremental_updates += 1
+
+        # The pledge that reaches the goal funds the vault, which takes it out of the ranking
+        if card["pledged_amount"] >= card["funding_goal"]:
+            del self._cards[vault_id], self._windows[vault_id]
+            return
+
+        window = self._windows[vault_id]
+        window[0] += amount
+        window[1] += amount
+        card["trending_score"] = self._scores[vault_id] = trending_score(card, window[0], window[1], datetime.utcnow())
+        insort(self._ranking, (-card["trending_score"], vault_id))
+
+    def page(self, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+        cards = [self._cards[vault_id] for _, vault_id in self._ranking[offset:offset + limit]]
+        for card in cards:
+            card["time_left"] = self.database._calculate_time_left(card["deadline"])
+        return cards
+
+    def _remove(self, vault_id: str):
+        score = self._scores.pop(vault_id, None)
+        if score is not None:
+            index = bisect_left(self._ranking, (-score, vault_id))
+            del self._ranking[index]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"ranked_vaults": len(self._ranking), "incremental_updates": self.incremental_updates}
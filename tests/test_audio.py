@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from backend.audio import MultipartFileStream, RangeNotSatisfiable, UploadTooLarge, iter_grid_out, parse_range
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("bytes=0-4", (0, 4)),
+    ("bytes=5-", (5, 9)),
+    ("bytes=-3", (7, 9)),
+    ("bytes=-30", (0, 9)),
+    ("bytes=2-100", (2, 9)),
+    ("bytes=0-1,3-4", None),
+    ("items=0-4", None),
+    ("bytes=-", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 10) == expected
+
+
+@pytest.mark.parametrize("header, size", [
+    ("bytes=10-", 10),
+    ("bytes=10-20", 10),
+    ("bytes=5-2", 10),
+    ("bytes=-0", 10),
+    ("bytes=-5", 0),
+    ("bytes=0-", 0),
+])
+def test_unsatisfiable_ranges(header, size):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, size)
+
+
+class FakeGridOut:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.position = 0
+
+    def seek(self, position: int):
+        self.position = position
+
+    async def read(self, size: int) -> bytes:
+        chunk = self.data[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+def test_iter_grid_out_streams_exactly_the_range(monkeypatch):
+    monkeypatch.setattr("backend.audio.AUDIO_CHUNK_SIZE", 4)
+    chunks = asyncio.run(collect(iter_grid_out(FakeGridOut(bytes(range(20))), 3, 10)))
+    assert b"".join(chunks) == bytes(range(3, 13))
+    assert max(len(chunk) for chunk in chunks) == 4
+
+
+class FakeRequest:
+    def __init__(self, body: bytes, boundary: str = "B", chunk_size: int = 7, content_length: bool = True):
+        self.headers = {"content-type": f"multipart/form-data; boundary={boundary}"}
+        if content_length:
+            self.headers["content-length"] = str(len(body))
+        self.body = body
+        self.chunk_size = chunk_size
+
+    async def stream(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+        yield b""
+
+
+def multipart_body(*parts) -> bytes:
+    body = b""
+    for name, filename, content_type, data in parts:
+        disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+        body += f"--B\r\nContent-Disposition: {disposition}\r\n".encode()
+        if content_type:
+            body += f"Content-Type: {content_type}\r\n".encode()
+        body += b"\r\n" + data + b"\r\n"
+    return body + b"--B--\r\n"
+
+
+async def read_upload(request, max_bytes: int = 1024):
+    upload = MultipartFileStream(request, max_bytes=max_bytes)
+    await upload.open()
+    return upload.filename, upload.content_type, b"".join(await collect(upload.chunks()))
+
+
+def test_multipart_stream_skips_other_fields():
+    recording = bytes(range(256)) * 2
+    body = multipart_body(("note", None, None, b"hello"), ("file", "rec.mp3", "audio/mpeg", recording))
+    assert asyncio.run(read_upload(FakeRequest(body))) == ("rec.mp3", "audio/mpeg", recording)
+
+
+def test_multipart_stream_requires_the_file_field():
+    body = multipart_body(("other", "rec.mp3", "audio/mpeg", b"data"))
+    with pytest.raises(ValueError, match="Missing file field"):
+        asyncio.run(read_upload(FakeRequest(body)))
+
+
+def test_multipart_stream_rejects_declared_oversized_bodies():
+    request = FakeRequest(b"x" * (200 * 1024))
+    with pytest.raises(UploadTooLarge):
+        MultipartFileStream(request, max_bytes=1024)
+
+
+def test_multipart_stream_enforces_the_cap_while_reading():
+    body = multipart_body(("file", "rec.mp3", "audio/mpeg", b"x" * 2048))
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(read_upload(FakeRequest(body, content_length=False)))
+
+
+def test_multipart_stream_requires_a_multipart_body():
+    request = FakeRequest(b"raw")
+    request.headers["content-type"] = "audio/mpeg"
+    with pytest.raises(ValueError):
+        MultipartFileStream(request)
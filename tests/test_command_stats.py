@@ -0,0 +1,43 @@
+import asyncio
+import contextvars
+import functools
+
+from backend.command_stats import CommandCounter, CommandStats, CommandStatsMiddleware
+
+
+def run_like_motor(loop, fn):
+    # Motor runs pymongo calls on an executor thread inside a copy of the caller's context
+    return loop.run_in_executor(None, functools.partial(contextvars.copy_context().run, fn))
+
+
+def test_commands_are_attributed_to_their_request():
+    counter = CommandCounter()
+    stats = CommandStats()
+
+    async def app(scope, receive, send):
+        loop = asyncio.get_running_loop()
+        commands = scope["commands"]
+        await asyncio.gather(*[run_like_motor(loop, lambda: counter.started(None)) for _ in range(commands)])
+
+    middleware = CommandStatsMiddleware(app, stats)
+
+    async def run():
+        await asyncio.gather(
+            middleware({"type": "http", "commands": 3}, None, None),
+            middleware({"type": "http", "commands": 1}, None, None),
+        )
+        # Outside a request nothing is counted
+        await run_like_motor(asyncio.get_running_loop(), lambda: counter.started(None))
+
+    asyncio.run(run())
+    assert stats.stats() == {"requests": 2, "commands": 4, "max_commands": 3, "commands_per_request": 2.0}
+
+
+def test_non_http_scopes_are_not_tracked():
+    stats = CommandStats()
+
+    async def app(scope, receive, send):
+        pass
+
+    asyncio.run(CommandStatsMiddleware(app, stats)({"type": "lifespan"}, None, None))
+    assert stats.requests == 0
@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+
+from backend.cache import ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Compute:
+    """A compute function returning how many times it has run; ``release`` lets pending runs finish."""
+
+    def __init__(self, blocked: bool = False):
+        self.calls = 0
+        self.release = asyncio.Event()
+        if not blocked:
+            self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        return call
+
+
+def make_cache(clock: Clock, ttl: float = 5.0, stale_ttl: float = 30.0) -> ResponseCache:
+    cache = ResponseCache(clock=clock)
+    cache.configure("vaults", ttl=ttl, stale_ttl=stale_ttl)
+    return cache
+
+
+async def refreshes_done(cache: ResponseCache):
+    await asyncio.gather(*cache._inflight.values(), return_exceptions=True)
+
+
+def test_miss_then_hit():
+    async def run():
+        cache, compute = make_cache(Clock()), Compute()
+        first = await cache.get_or_compute("vaults", {"limit": 20}, compute)
+        second = await cache.get_or_compute("vaults", {"limit": 20}, compute)
+        return first, second, compute.calls
+
+    first, second, calls = asyncio.run(run())
+    assert first == (1, "MISS", 0.0)
+    assert second == (1, "HIT", 0.0)
+    assert calls == 1
+
+
+def test_equivalent_params_share_an_entry():
+    assert ResponseCache.make_key("vaults", {"limit": 20, "status": None}) == ResponseCache.make_key("vaults", {"limit": "20"})
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    async def run():
+        clock = Clock()
+        cache, compute = make_cache(clock), Compute()
+        await cache.get_or_compute("vaults", {}, compute)
+
+        clock.now += 10  # Past ttl, within stale_ttl
+        stale = [await cache.get_or_compute("vaults", {}, compute) for _ in range(3)]
+        await refreshes_done(cache)
+        fresh = await cache.get_or_compute("vaults", {}, compute)
+        return stale, fresh, compute.calls
+
+    stale, fresh, calls = asyncio.run(run())
+    assert stale == [(1, "STALE", 10.0)] * 3
+    assert fresh == (2, "HIT", 0.0)
+    assert calls == 2
+
+
+def test_entry_past_stale_window_is_a_miss():
+    async def run():
+        clock = Clock()
+        cache, compute = make_cache(clock), Compute()
+        await cache.get_or_compute("vaults", {}, compute)
+        clock.now += 35
+        return await cache.get_or_compute("vaults", {}, compute)
+
+    assert asyncio.run(run()) == (2, "MISS", 0.0)
+
+
+def test_concurrent_misses_share_one_computation():
+    async def run():
+        cache, compute = make_cache(Clock()), Compute(blocked=True)
+        waiters = [asyncio.ensure_future(cache.get_or_compute("vaults", {}, compute)) for _ in range(5)]
+        await asyncio.sleep(0)
+        compute.release.set()
+        return await asyncio.gather(*waiters), compute.calls
+
+    results, calls = asyncio.run(run())
+    assert results == [(1, "MISS", 0.0)] * 5
+    assert calls == 1
+
+
+def test_invalidate_during_refresh_discards_its_result():
+    async def run():
+        cache, compute = make_cache(Clock()), Compute(blocked=True)
+        before = asyncio.ensure_future(cache.get_or_compute("vaults", {}, compute))
+        await asyncio.sleep(0)
+        cache.invalidate("vaults")
+
+        # Started after the invalidation, so it must not join the earlier refresh
+        after = asyncio.ensure_future(cache.get_or_compute("vaults", {}, compute))
+        await asyncio.sleep(0)
+        compute.release.set()
+        results = await asyncio.gather(before, after)
+        cached = await cache.get_or_compute("vaults", {}, compute)
+        return results, cached, compute.calls
+
+    (before, after), cached, calls = asyncio.run(run())
+    assert before == (1, "MISS", 0.0)
+    assert after == (2, "MISS", 0.0)
+    assert cached == (2, "HIT", 0.0)
+    assert calls == 2
+
+
+def test_failed_computation_is_not_cached():
+    async def run():
+        cache = make_cache(Clock())
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("vaults", {}, fail)
+        value = await cache.get_or_compute("vaults", {}, Compute())
+        return value, cache.stats()["vaults"]
+
+    value, stats = asyncio.run(run())
+    assert value == (1, "MISS", 0.0)
+    assert stats["refresh_errors"] == 1
+    assert stats["misses"] == 2
@@ -0,0 +1,107 @@
+import asyncio
+
+from backend.search import SearchIndex, document_terms, tokenize
+
+
+def vault(vault_id: str, title: str, status: str = "live", category: str = "Unhinged", **fields):
+    return {"id": vault_id, "title": title, "status": status, "category": category, **fields}
+
+
+async def as_async(items):
+    for item in items:
+        yield item
+
+
+def built_index(*vaults) -> SearchIndex:
+    index = SearchIndex()
+    asyncio.run(index.rebuild(as_async(vaults)))
+    return index
+
+
+def test_tokenize_drops_stopwords_and_case():
+    assert tokenize("The Wedding of a Producer!") == ["wedding", "producer"]
+
+
+def test_title_outweighs_description():
+    terms = document_terms(vault("v", "wedding", description="wedding leak", tags=["leak"]))
+    assert terms == {"wedding": 4.0, "leak": 3.0}
+
+
+def test_base_segment_ranks_by_field_weight():
+    index = built_index(
+        vault("a", "cricket", description="wedding"),
+        vault("b", "wedding scandal"),
+        vault("c", "unrelated"),
+    )
+    assert index.search("wedding") == (["b", "a"], 2)
+    assert index.stats()["base_terms"] == 4
+
+
+def test_terms_are_anded():
+    index = built_index(vault("a", "wedding scandal"), vault("b", "wedding"))
+    assert index.search("wedding scandal") == (["a"], 1)
+    assert index.search("wedding missing") == ([], 0)
+
+
+def test_last_term_is_a_prefix():
+    index = built_index(vault("a", "bollywood"), vault("b", "bolly"), vault("c", "cricket"))
+    ids, total = index.search("boll")
+    assert sorted(ids) == ["a", "b"] and total == 2
+    # Only the last term expands
+    assert index.search("boll cricket") == ([], 0)
+
+
+def test_delta_segment_is_searchable_alongside_base():
+    index = built_index(vault("a", "wedding"))
+    index.add(vault("b", "wedding bells"))
+    ids, total = index.search("wedd")
+    assert sorted(ids) == ["a", "b"] and total == 2
+    assert index.stats()["delta_documents"] == 1
+
+
+def test_readding_replaces_the_base_entry():
+    index = built_index(vault("a", "wedding"))
+    index.add(vault("a", "divorce"))
+    assert index.search("wedding") == ([], 0)
+    assert index.search("divorce") == (["a"], 1)
+    assert len(index) == 1
+
+
+def test_remove_and_filters():
+    index = built_index(
+        vault("a", "leak", status="live"),
+        vault("b", "leak", status="funded"),
+        vault("c", "leak", category="Corporate Whistleblowing"),
+    )
+    assert index.search("leak", status="funded") == (["b"], 1)
+    assert index.search("leak", category="Corporate Whistleblowing") == (["c"], 1)
+    index.set_status("a", "expired")
+    assert index.search("leak", status="live") == (["c"], 1)
+    index.remove("c")
+    assert index.search("leak", status="live") == ([], 0)
+
+
+def test_pagination_reports_the_full_total():
+    index = built_index(*[vault(f"v{i}", "leak") for i in range(5)])
+    first, total = index.search("leak", limit=2)
+    rest, _ = index.search("leak", limit=2, offset=2)
+    assert total == 5 and len(first) == 2 and len(rest) == 2
+    assert not set(first) & set(rest)
+
+
+def test_writes_during_rebuild_are_replayed():
+    index = built_index(vault("a", "old title"))
+
+    async def source():
+        yield vault("a", "old title")
+        index.add(vault("a", "new title"))
+        index.add(vault("b", "fresh vault"))
+        index.set_status("b", "funded")
+        yield vault("c", "gone soon")
+        index.remove("c")
+
+    asyncio.run(index.rebuild(source()))
+    assert index.search("new") == (["a"], 1)
+    assert index.search("old") == ([], 0)
+    assert index.search("fresh", status="funded") == (["b"], 1)
+    assert index.search("gone") == ([], 0)
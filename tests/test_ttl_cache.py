@@ -0,0 +1,61 @@
+from backend.cache import TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_returns_unexpired_values():
+    clock = Clock()
+    cache = TTLCache(maxsize=10, ttl=10, clock=clock)
+    cache.set("a", 1)
+    clock.now += 9
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = TTLCache(maxsize=10, ttl=10, clock=clock)
+    cache.set("a", 1)
+    clock.now += 10
+    assert cache.get("a", "missing") == "missing"
+    assert len(cache) == 0
+    assert cache.stats()["misses"] == 1
+
+
+def test_per_entry_ttl_is_capped_by_the_cache_ttl():
+    clock = Clock()
+    cache = TTLCache(maxsize=10, ttl=10, clock=clock)
+    cache.set("short", 1, ttl=2)
+    cache.set("long", 2, ttl=60)
+    cache.set("never", 3, ttl=0)
+    clock.now += 5
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert cache.get("never") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=10, clock=Clock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_items_skips_expired_entries_without_counting_lookups():
+    clock = Clock()
+    cache = TTLCache(maxsize=10, ttl=10, clock=clock)
+    cache.set("a", 1, ttl=5)
+    cache.set("b", 2)
+    clock.now += 6
+    assert cache.items() == [("b", 2)]
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0